@@ -22,12 +22,13 @@ Usage:
 __version__ = "0.1.0"
 
 from .receiver import WebhookReceiver, WebhookResult, process_webhook
-from .signal import Signal, SignalType
+from .signal import Signal, SignalData, SignalType
 
 __all__ = [
     "WebhookReceiver",
     "WebhookResult",
     "process_webhook",
     "Signal",
+    "SignalData",
     "SignalType",
 ]
@@ -365,7 +365,10 @@ def cmd_serve(args):
             if result.success and result.signal:
                 print(f"  {result.signal.format()}")
 
-            return web.json_response(result.to_dict())
+            return web.Response(
+                body=result.to_json_bytes(),
+                content_type="application/json",
+            )
 
         except Exception as e:
             return web.json_response({"error": str(e)}, status=500)
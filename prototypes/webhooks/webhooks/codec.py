@@ -0,0 +1,28 @@
+"""
+JSON codec for webhook bodies and signals.
+
+Uses orjson when it is installed (parses bytes directly, much faster
+dumps) and falls back to the standard library otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: bytes) -> Any:
+    """Decode a JSON document from raw bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object as JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
@@ -4,17 +4,34 @@ Base webhook handler interface.
 All handlers implement this interface.
 """
 
+import hmac
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from ..signal import Signal
 
 
+@lru_cache(maxsize=64)
+def _hmac_prototype(secret: str) -> "hmac.HMAC":
+    """Keyed HMAC-SHA256 state, built once per secret and copied per use."""
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
 class WebhookHandler(ABC):
     """Base class for webhook handlers."""
 
     name: str = "base"
     target_org: str = "OS"  # Default target org
 
+    # Headers whose presence alone identifies this provider
+    SIGNATURE_HEADERS: Tuple[str, ...] = ()
+
+    # Header carrying an HMAC over the body alone. Leave unset when the
+    # signed payload also covers a timestamp (Stripe, Slack): retries of
+    # the same body then carry a different signature.
+    HMAC_HEADER: Optional[str] = None
+
     @abstractmethod
     def can_handle(self, headers: Dict[str, str], body: Dict[str, Any]) -> bool:
         """Check if this handler can process the webhook."""
@@ -29,6 +46,13 @@ class WebhookHandler(ABC):
         """Verify webhook signature. Override in subclass."""
         return True  # Default: no verification
 
+    def hmac_sha256(self, secret: str, *parts: bytes) -> str:
+        """HMAC-SHA256 hex digest over parts, reusing the keyed state."""
+        ctx = _hmac_prototype(secret).copy()
+        for part in parts:
+            ctx.update(part)
+        return ctx.hexdigest()
+
     def get_header(self, headers: Dict[str, str], name: str) -> Optional[str]:
         """Get header value (case-insensitive)."""
         name_lower = name.lower()
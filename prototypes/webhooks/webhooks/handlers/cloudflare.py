@@ -21,6 +21,7 @@ class CloudflareHandler(WebhookHandler):
 
     name = "cloudflare"
     target_org = "CLD"
+    SIGNATURE_HEADERS = ("CF-Webhook-Auth",)
 
     # Alert type to signal mapping
     ALERT_MAP = {
@@ -1,7 +1,6 @@
 """Figma webhook handler."""
 
 import hmac
-import hashlib
 from typing import Dict, Any, Optional
 from .base import WebhookHandler
 from ..signal import Signal, SignalType
@@ -22,6 +21,8 @@ class FigmaHandler(WebhookHandler):
 
     name = "figma"
     target_org = "STU"  # Design goes to Studio
+    SIGNATURE_HEADERS = ("X-Figma-Signature",)
+    HMAC_HEADER = "X-Figma-Signature"
 
     # Event type to signal mapping
     EVENT_MAP = {
@@ -66,11 +67,7 @@ class FigmaHandler(WebhookHandler):
                 return False
 
         # Verify HMAC signature
-        expected = hmac.new(
-            secret.encode(),
-            body,
-            hashlib.sha256
-        ).hexdigest()
+        expected = self.hmac_sha256(secret, body)
 
         return hmac.compare_digest(signature, expected)
 
@@ -152,5 +149,5 @@ class FigmaHandler(WebhookHandler):
 
     def _parse_json(self, body: bytes) -> Dict[str, Any]:
         """Parse JSON body."""
-        import json
-        return json.loads(body.decode())
+        from .. import codec
+        return codec.loads(body)
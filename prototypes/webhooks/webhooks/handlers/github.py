@@ -1,7 +1,6 @@
 """GitHub webhook handler."""
 
 import hmac
-import hashlib
 from typing import Dict, Any, Optional
 from .base import WebhookHandler
 from ..signal import Signal, SignalType
@@ -21,6 +20,8 @@ class GitHubHandler(WebhookHandler):
 
     name = "github"
     target_org = "OS"
+    SIGNATURE_HEADERS = ("X-GitHub-Event",)
+    HMAC_HEADER = "X-Hub-Signature-256"
 
     # Event to signal type mapping
     EVENT_MAP = {
@@ -46,11 +47,7 @@ class GitHubHandler(WebhookHandler):
         if not signature:
             return False
 
-        expected = "sha256=" + hmac.new(
-            secret.encode(),
-            body,
-            hashlib.sha256
-        ).hexdigest()
+        expected = "sha256=" + self.hmac_sha256(secret, body)
 
         return hmac.compare_digest(signature, expected)
 
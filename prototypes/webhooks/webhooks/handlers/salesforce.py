@@ -142,5 +142,5 @@ class SalesforceHandler(WebhookHandler):
 
     def _parse_json(self, body: bytes) -> Dict[str, Any]:
         """Parse JSON body."""
-        import json
-        return json.loads(body.decode())
+        from .. import codec
+        return codec.loads(body)
@@ -1,11 +1,62 @@
 """Slack webhook handler."""
 
 import hmac
-import hashlib
 import time
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 from .base import WebhookHandler
-from ..signal import Signal, SignalType
+from ..signal import Signal, SignalData, SignalType
+
+
+# Replay window for X-Slack-Request-Timestamp
+_MAX_SKEW_NS = 300 * 1_000_000_000
+
+
+@dataclass(slots=True)
+class EventData(SignalData):
+    """Fields shared by every Events API payload."""
+    event: str
+    team_id: str
+    channel: str
+    user: str
+    ts: str
+
+
+@dataclass(slots=True)
+class MessageEventData(EventData):
+    text: str
+    thread_ts: str
+
+
+@dataclass(slots=True)
+class ReactionEventData(EventData):
+    reaction: str
+    item_ts: str
+
+
+@dataclass(slots=True)
+class MemberEventData(EventData):
+    user_id: str
+
+
+@dataclass(slots=True)
+class MentionEventData(EventData):
+    text: str
+    mentioned_user_id: str
+
+
+def _event_payload(event_type: str) -> type:
+    """Payload dataclass for an Events API event type."""
+    if "message" in event_type:
+        return MessageEventData
+    if "reaction" in event_type:
+        return ReactionEventData
+    if "member" in event_type or "team_join" in event_type:
+        return MemberEventData
+    if event_type == "app_mention":
+        return MentionEventData
+    return EventData
 
 
 class SlackHandler(WebhookHandler):
@@ -24,9 +75,10 @@ class SlackHandler(WebhookHandler):
 
     name = "slack"
     target_org = "OS"  # Slack is general communication
+    SIGNATURE_HEADERS = ("X-Slack-Signature",)
 
     # Event type to signal mapping
-    EVENT_MAP = {
+    EVENT_MAP = MappingProxyType({
         # Messages
         "message": SignalType.MESSAGE,
         "message.channels": SignalType.MESSAGE,
@@ -54,6 +106,12 @@ class SlackHandler(WebhookHandler):
         "block_actions": SignalType.BUTTON_CLICK,
         "view_submission": SignalType.FORM_SUBMIT,
         "shortcut": SignalType.SHORTCUT,
+    })
+
+    # Event -> (signal type, payload class), resolved once at import
+    _ROUTES = {
+        event: (signal_type, _event_payload(event))
+        for event, signal_type in EVENT_MAP.items()
     }
 
     def can_handle(self, headers: Dict[str, str], body: Dict[str, Any]) -> bool:
@@ -83,21 +141,17 @@ class SlackHandler(WebhookHandler):
         if not signature or not timestamp:
             return False
 
-        # Check timestamp isn't too old (5 minutes)
-        try:
-            ts = int(timestamp)
-            if abs(time.time() - ts) > 300:
-                return False
-        except ValueError:
+        # Check timestamp isn't too old (5 minutes), in integer nanoseconds.
+        # isascii() guards isdigit(), which also accepts e.g. superscripts.
+        if not (timestamp.isascii() and timestamp.isdigit()):
+            return False
+        if abs(time.time_ns() - int(timestamp) * 1_000_000_000) > _MAX_SKEW_NS:
             return False
 
-        # Compute expected signature
-        sig_basestring = f"v0:{timestamp}:{body.decode()}"
-        expected = "v0=" + hmac.new(
-            secret.encode(),
-            sig_basestring.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        # Compute expected signature over v0:{timestamp}:{body}
+        expected = "v0=" + self.hmac_sha256(
+            secret, b"v0:", timestamp.encode(), b":", body
+        )
 
         return hmac.compare_digest(signature, expected)
 
@@ -146,42 +200,56 @@ class SlackHandler(WebhookHandler):
         if event_type == "message" and event.get("subtype"):
             event_type = f"message.{event.get('subtype')}"
 
-        signal_type = self.EVENT_MAP.get(event_type, SignalType.CUSTOM)
-
-        data = {
-            "event": event_type,
-            "team_id": body.get("team_id", ""),
-            "channel": event.get("channel", ""),
-            "user": event.get("user", ""),
-            "ts": event.get("ts", ""),
-        }
+        route = self._ROUTES.get(event_type)
+        if route is None:
+            route = (SignalType.CUSTOM, _event_payload(event_type))
+        signal_type, payload = route
+
+        # team_join and user_change carry a user object, not an ID
+        user = event.get("user")
+        user_id = user.get("id", "") if isinstance(user, dict) else (user or "")
+
+        common = (
+            event_type,
+            body.get("team_id", ""),
+            event.get("channel", ""),
+            user_id,
+            event.get("ts", ""),
+        )
 
         # Message events
-        if "message" in event_type:
-            data.update({
-                "text": event.get("text", "")[:200],  # Truncate long messages
-                "thread_ts": event.get("thread_ts", ""),
-            })
+        if payload is MessageEventData:
+            data = MessageEventData(
+                *common,
+                text=event.get("text", "")[:200],  # Truncate long messages
+                thread_ts=event.get("thread_ts", ""),
+            )
 
         # Reaction events
-        elif "reaction" in event_type:
-            data.update({
-                "reaction": event.get("reaction", ""),
-                "item_ts": event.get("item", {}).get("ts", ""),
-            })
+        elif payload is ReactionEventData:
+            data = ReactionEventData(
+                *common,
+                reaction=event.get("reaction", ""),
+                item_ts=event.get("item", {}).get("ts", ""),
+            )
 
         # Member events
-        elif "member" in event_type or "team_join" in event_type:
-            data.update({
-                "user_id": event.get("user", event.get("user", {}).get("id", "")),
-            })
+        elif payload is MemberEventData:
+            data = MemberEventData(
+                *common,
+                user_id=user_id,
+            )
 
         # App mention
-        elif event_type == "app_mention":
-            data.update({
-                "text": event.get("text", "")[:200],
-                "mentioned_user_id": body.get("authorizations", [{}])[0].get("user_id", ""),
-            })
+        elif payload is MentionEventData:
+            data = MentionEventData(
+                *common,
+                text=event.get("text", "")[:200],
+                mentioned_user_id=body.get("authorizations", [{}])[0].get("user_id", ""),
+            )
+
+        else:
+            data = EventData(*common)
 
         return Signal(
             type=signal_type,
@@ -211,20 +279,19 @@ class SlackHandler(WebhookHandler):
         if payload_type == "block_actions":
             actions = body.get("actions", [{}])
             action = actions[0] if actions else {}
-            data.update({
-                "action_id": action.get("action_id", ""),
-                "block_id": action.get("block_id", ""),
-                "value": action.get("value", action.get("selected_option", {}).get("value", "")),
-            })
+            data["action_id"] = action.get("action_id", "")
+            data["block_id"] = action.get("block_id", "")
+            if "value" in action:
+                data["value"] = action["value"]
+            else:
+                data["value"] = action.get("selected_option", {}).get("value", "")
 
         # View submissions (modals)
         elif payload_type == "view_submission":
             view = body.get("view", {})
-            data.update({
-                "view_id": view.get("id", ""),
-                "callback_id": view.get("callback_id", ""),
-                "values": view.get("state", {}).get("values", {}),
-            })
+            data["view_id"] = view.get("id", "")
+            data["callback_id"] = view.get("callback_id", "")
+            data["values"] = view.get("state", {}).get("values", {})
 
         return Signal(
             type=signal_type,
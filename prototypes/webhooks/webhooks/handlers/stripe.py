@@ -1,12 +1,23 @@
 """Stripe webhook handler."""
 
 import hmac
-import hashlib
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 from .base import WebhookHandler
 from ..signal import Signal, SignalType
 
 
+def _event_family(event_type: str) -> str:
+    """Payload family used to pick which object fields to extract."""
+    if "payment" in event_type or "charge" in event_type:
+        return "payment"
+    if "subscription" in event_type:
+        return "subscription"
+    if "invoice" in event_type:
+        return "invoice"
+    return ""
+
+
 class StripeHandler(WebhookHandler):
     """
     Handle Stripe webhooks.
@@ -21,9 +32,10 @@ class StripeHandler(WebhookHandler):
 
     name = "stripe"
     target_org = "FND"
+    SIGNATURE_HEADERS = ("Stripe-Signature",)
 
     # Event to signal type mapping
-    EVENT_MAP = {
+    EVENT_MAP = MappingProxyType({
         "payment_intent.succeeded": SignalType.PAYMENT_RECEIVED,
         "payment_intent.payment_failed": SignalType.PAYMENT_FAILED,
         "charge.succeeded": SignalType.PAYMENT_RECEIVED,
@@ -33,6 +45,12 @@ class StripeHandler(WebhookHandler):
         "customer.subscription.updated": SignalType.RECORD_UPDATED,
         "invoice.paid": SignalType.INVOICE_PAID,
         "invoice.payment_failed": SignalType.PAYMENT_FAILED,
+    })
+
+    # Event -> (signal type, payload family), resolved once at import
+    _ROUTES = {
+        event: (signal_type, _event_family(event))
+        for event, signal_type in EVENT_MAP.items()
     }
 
     def can_handle(self, headers: Dict[str, str], body: Dict[str, Any]) -> bool:
@@ -48,59 +66,71 @@ class StripeHandler(WebhookHandler):
         if not sig_header:
             return False
 
-        # Parse signature header
-        elements = dict(item.split("=") for item in sig_header.split(","))
-        timestamp = elements.get("t", "")
-        signature = elements.get("v1", "")
-
-        # Compute expected signature
-        payload = f"{timestamp}.{body.decode()}"
-        expected = hmac.new(
-            secret.encode(),
-            payload.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        # Parse signature header in one scan (t=...,v1=...,v0=...)
+        timestamp = signature = ""
+        rest = sig_header
+        while rest:
+            segment, _, rest = rest.partition(",")
+            key, _, value = segment.partition("=")
+            if key == "t":
+                timestamp = value
+            elif key == "v1":
+                signature = value
+            if timestamp and signature:
+                break
+
+        # Compute expected signature over {timestamp}.{body}
+        expected = self.hmac_sha256(secret, timestamp.encode(), b".", body)
 
         return hmac.compare_digest(signature, expected)
 
     def parse(self, headers: Dict[str, str], body: Dict[str, Any]) -> Signal:
         """Parse Stripe webhook into Signal."""
         event_type = body.get("type", "unknown")
-        signal_type = self.EVENT_MAP.get(event_type, SignalType.CUSTOM)
+        route = self._ROUTES.get(event_type)
+        if route is None:
+            route = (SignalType.CUSTOM, _event_family(event_type))
+        signal_type, family = route
 
         # Extract data from event object
         obj = body.get("data", {}).get("object", {})
 
-        data = {
-            "event": event_type,
-            "id": obj.get("id", ""),
-        }
-
-        # Payment events
-        if "payment" in event_type or "charge" in event_type:
-            data.update({
+        # One dict literal per family (no build-then-update)
+        if family == "payment":
+            data = {
+                "event": event_type,
+                "id": obj.get("id", ""),
                 "amount": obj.get("amount", 0) / 100,  # Convert cents to dollars
                 "currency": obj.get("currency", "usd").upper(),
                 "customer": obj.get("customer", ""),
                 "status": obj.get("status", ""),
-            })
+            }
 
-        # Subscription events
-        elif "subscription" in event_type:
-            data.update({
+        elif family == "subscription":
+            plan = obj.get("plan", {})
+            data = {
+                "event": event_type,
+                "id": obj.get("id", ""),
                 "customer": obj.get("customer", ""),
                 "status": obj.get("status", ""),
-                "plan": obj.get("plan", {}).get("id", ""),
-                "amount": obj.get("plan", {}).get("amount", 0) / 100,
-            })
-
-        # Invoice events
-        elif "invoice" in event_type:
-            data.update({
+                "plan": plan.get("id", ""),
+                "amount": plan.get("amount", 0) / 100,
+            }
+
+        elif family == "invoice":
+            data = {
+                "event": event_type,
+                "id": obj.get("id", ""),
                 "customer": obj.get("customer", ""),
                 "amount": obj.get("amount_paid", 0) / 100,
                 "status": obj.get("status", ""),
-            })
+            }
+
+        else:
+            data = {
+                "event": event_type,
+                "id": obj.get("id", ""),
+            }
 
         return Signal(
             type=signal_type,
@@ -5,12 +5,17 @@ Receives webhooks from all providers, converts them to signals,
 and dispatches them to the appropriate org.
 """
 
-import json
-from typing import Dict, Any, Optional, List, Type
-from datetime import datetime
+import hashlib
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Any, Optional, List, Tuple, Type
 from dataclasses import dataclass, field
 
-from .signal import Signal, SignalType
+from . import codec
+from .signal import Signal, SignalType, utc_now_iso
 from .handlers import (
     WebhookHandler,
     GitHubHandler,
@@ -36,7 +41,7 @@ class WebhookResult:
 
     def __post_init__(self):
         if not self.timestamp:
-            self.timestamp = datetime.utcnow().isoformat()
+            self.timestamp = utc_now_iso()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -50,6 +55,10 @@ class WebhookResult:
             "timestamp": self.timestamp,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes."""
+        return codec.dumps(self.to_dict())
+
 
 class WebhookReceiver:
     """
@@ -83,6 +92,16 @@ class WebhookReceiver:
         FigmaHandler,
     ]
 
+    # Parsed bodies kept for retried deliveries (Stripe retries, Slack Retry-Num)
+    JSON_CACHE_SIZE: int = 1024
+
+    # Results retained for stats and recent_signals()
+    HISTORY_SIZE: int = 10_000
+
+    # Keep the original payload on signal.raw (debugging); off so the
+    # history doesn't pin every parsed body
+    RETAIN_RAW: bool = False
+
     def __init__(
         self,
         secrets: Optional[Dict[str, str]] = None,
@@ -97,7 +116,18 @@ class WebhookReceiver:
         """
         self.secrets = secrets or {}
         self.handlers = handlers or [h() for h in self.DEFAULT_HANDLERS]
-        self._history: List[WebhookResult] = []
+        self._header_index: Dict[str, WebhookHandler] = {}
+        for handler in self.handlers:
+            self._index_handler(handler)
+        self._history: Deque[WebhookResult] = deque(maxlen=self.HISTORY_SIZE)
+        self._by_handler: Counter = Counter()
+        self._by_signal: Counter = Counter()
+        self._success_count = 0
+        self._total_ms = 0
+        # Guards history, stats and the JSON cache when workers are running
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._json_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
 
     def process(
         self,
@@ -116,40 +146,45 @@ class WebhookReceiver:
         Returns:
             WebhookResult with signal or error
         """
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
+
+        # Route on headers first, so requests that fail verification are
+        # rejected before the JSON decode
+        handler = self._find_handler_fast(headers, provider_hint)
+        cache_key = None
+        if handler:
+            verified, failure = self._verify(handler, headers, body)
+            if failure:
+                return failure
+            cache_key = self._signature_key(handler, headers, verified)
 
         # Parse body to dict
         try:
-            body_dict = json.loads(body.decode())
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            body_dict = self._load_body(body, cache_key)
+        except (ValueError, UnicodeDecodeError) as e:
             return WebhookResult(
                 success=False,
                 error=f"Invalid JSON body: {str(e)}",
             )
 
-        # Find handler
-        handler = self._find_handler(headers, body_dict, provider_hint)
+        # Fall back to body-based handler detection
         if not handler:
-            return WebhookResult(
-                success=False,
-                error="No handler found for this webhook",
-            )
+            handler = self._find_handler(headers, body_dict)
+            if not handler:
+                return WebhookResult(
+                    success=False,
+                    error="No handler found for this webhook",
+                )
 
-        # Verify signature
-        secret = self.secrets.get(handler.name)
-        verified = handler.verify(headers, body, secret)
-
-        if secret and not verified:
-            return WebhookResult(
-                success=False,
-                handler=handler.name,
-                verified=False,
-                error="Signature verification failed",
-            )
+            verified, failure = self._verify(handler, headers, body)
+            if failure:
+                return failure
 
         # Parse webhook to signal
         try:
             signal = handler.parse(headers, body_dict)
+            if not self.RETAIN_RAW:
+                signal.raw = None
         except Exception as e:
             return WebhookResult(
                 success=False,
@@ -158,7 +193,7 @@ class WebhookReceiver:
                 error=f"Failed to parse webhook: {str(e)}",
             )
 
-        processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
+        processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
 
         result = WebhookResult(
             success=True,
@@ -169,10 +204,154 @@ class WebhookReceiver:
         )
 
         # Track history
-        self._history.append(result)
+        self._record(result)
 
         return result
 
+    def process_batch(
+        self,
+        items: List[Tuple[Dict[str, str], bytes]],
+    ) -> List[WebhookResult]:
+        """
+        Process a queue of pending webhooks.
+
+        Deliveries that share a provider secret reuse the same keyed
+        HMAC state, so only the body bytes are hashed per item.
+
+        Args:
+            items: List of (headers, body) pairs
+
+        Returns:
+            WebhookResult per item, in input order
+        """
+        return [self.process(headers, body) for headers, body in items]
+
+    def start_workers(self, n: Optional[int] = None) -> None:
+        """
+        Start a thread pool for process_async().
+
+        HMAC and hashing release the GIL on large bodies, so verification
+        of concurrent deliveries overlaps across cores.
+
+        Args:
+            n: Number of worker threads (defaults to CPU count)
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=n or os.cpu_count() or 1,
+                thread_name_prefix="webhook",
+            )
+
+    def stop_workers(self, wait: bool = True) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def process_async(
+        self,
+        headers: Dict[str, str],
+        body: bytes,
+        provider_hint: Optional[str] = None,
+    ) -> "Future[WebhookResult]":
+        """Submit a webhook to the worker pool (started on first use)."""
+        if self._executor is None:
+            self.start_workers()
+        return self._executor.submit(self.process, headers, body, provider_hint)
+
+    def _record(self, result: WebhookResult) -> None:
+        """Append to history, keeping running stats in step with evictions."""
+        with self._lock:
+            if len(self._history) == self._history.maxlen:
+                self._tally(self._history[0], -1)
+            self._history.append(result)
+            self._tally(result, 1)
+
+    def _tally(self, result: WebhookResult, delta: int) -> None:
+        """Add (or with delta=-1, remove) a result's contribution to stats."""
+        self._by_handler[result.handler] += delta
+        if result.signal:
+            self._by_signal[result.signal.type.value] += delta
+        if result.success:
+            self._success_count += delta
+        self._total_ms += delta * result.processing_time_ms
+
+    def _signature_key(
+        self,
+        handler: WebhookHandler,
+        headers: Dict[str, str],
+        verified: bool,
+    ) -> Optional[bytes]:
+        """
+        JSON cache key from a verified HMAC signature.
+
+        A signature that checked out against our secret already pins the
+        body, so it can stand in for hashing the body again. Only handlers
+        whose HMAC covers the body alone declare HMAC_HEADER; the rest
+        fall back to the body digest, so retries still hit the cache.
+        """
+        if not (verified and handler.HMAC_HEADER and self.secrets.get(handler.name)):
+            return None
+        signature = handler.get_header(headers, handler.HMAC_HEADER)
+        if not signature:
+            return None
+        return f"{handler.name}:{signature}".encode()
+
+    def _load_body(self, body: bytes, key: Optional[bytes] = None) -> Dict[str, Any]:
+        """Parse the JSON body, reusing the result for identical bodies."""
+        if key is None:
+            key = hashlib.blake2b(body, digest_size=16).digest()
+        with self._lock:
+            cached = self._json_cache.get(key)
+            if cached is not None:
+                self._json_cache.move_to_end(key)
+                return cached
+
+        body_dict = codec.loads(body)
+        with self._lock:
+            self._json_cache[key] = body_dict
+            if len(self._json_cache) > self.JSON_CACHE_SIZE:
+                self._json_cache.popitem(last=False)
+        return body_dict
+
+    def _verify(
+        self,
+        handler: WebhookHandler,
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> Tuple[bool, Optional[WebhookResult]]:
+        """Verify the signature; returns (verified, failure result or None)."""
+        secret = self.secrets.get(handler.name)
+        verified = handler.verify(headers, body, secret)
+
+        if secret and not verified:
+            return False, WebhookResult(
+                success=False,
+                handler=handler.name,
+                verified=False,
+                error="Signature verification failed",
+            )
+
+        return verified, None
+
+    def _find_handler_fast(
+        self,
+        headers: Dict[str, str],
+        provider_hint: Optional[str] = None,
+    ) -> Optional[WebhookHandler]:
+        """Find a handler from headers alone, without decoding JSON."""
+        if provider_hint:
+            for handler in self.handlers:
+                if handler.name == provider_hint:
+                    return handler
+
+        for key in headers:
+            handler = self._header_index.get(key.lower())
+            if handler:
+                return handler
+
+        return None
+
     def _find_handler(
         self,
         headers: Dict[str, str],
@@ -186,7 +365,13 @@ class WebhookReceiver:
                 if handler.name == provider_hint:
                     return handler
 
-        # Try each handler
+        # Definitive provider headers resolve with a single lookup
+        for key in headers:
+            handler = self._header_index.get(key.lower())
+            if handler:
+                return handler
+
+        # Fall back to body-based detection
         for handler in self.handlers:
             if handler.can_handle(headers, body):
                 return handler
@@ -196,6 +381,12 @@ class WebhookReceiver:
     def register_handler(self, handler: WebhookHandler) -> None:
         """Register a custom handler."""
         self.handlers.append(handler)
+        self._index_handler(handler)
+
+    def _index_handler(self, handler: WebhookHandler) -> None:
+        """Add a handler's signature headers to the dispatch index."""
+        for header in handler.SIGNATURE_HEADERS:
+            self._header_index.setdefault(header.lower(), handler)
 
     def set_secret(self, provider: str, secret: str) -> None:
         """Set the secret for a provider."""
@@ -212,28 +403,27 @@ class WebhookReceiver:
                 "by_signal_type": {},
             }
 
-        successful = [r for r in self._history if r.success]
-        by_handler: Dict[str, int] = {}
-        by_signal: Dict[str, int] = {}
-
-        for r in self._history:
-            by_handler[r.handler] = by_handler.get(r.handler, 0) + 1
-            if r.signal:
-                sig_type = r.signal.type.value
-                by_signal[sig_type] = by_signal.get(sig_type, 0) + 1
-
-        return {
-            "total": len(self._history),
-            "success_rate": len(successful) / len(self._history),
-            "avg_processing_ms": sum(r.processing_time_ms for r in self._history) / len(self._history),
-            "by_handler": by_handler,
-            "by_signal_type": by_signal,
-        }
+        with self._lock:
+            total = len(self._history)
+            return {
+                "total": total,
+                "success_rate": self._success_count / total,
+                "avg_processing_ms": self._total_ms / total,
+                "by_handler": dict(+self._by_handler),
+                "by_signal_type": dict(+self._by_signal),
+            }
 
     def recent_signals(self, limit: int = 10) -> List[Signal]:
         """Get recent processed signals."""
-        signals = [r.signal for r in self._history if r.signal]
-        return signals[-limit:]
+        signals: List[Signal] = []
+        with self._lock:
+            for r in reversed(self._history):
+                if len(signals) >= limit:
+                    break
+                if r.signal:
+                    signals.append(r.signal)
+        signals.reverse()
+        return signals
 
 
 # Convenience function for simple webhook processing
@@ -4,10 +4,20 @@ Signal - The universal message format.
 Every webhook becomes a signal that flows through the mesh.
 """
 
+import hashlib
+import time
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from enum import Enum
+from types import MappingProxyType
+
+from . import codec
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 
 class SignalType(Enum):
@@ -103,6 +113,94 @@ class SignalType(Enum):
     ERROR = "error"
 
 
+# Emoji per signal type, built once at import
+_SIGNAL_EMOJI = MappingProxyType({
+    # GitHub
+    SignalType.PUSH: "📥",
+    SignalType.PULL_REQUEST: "🔀",
+    SignalType.ISSUE: "📝",
+    SignalType.WORKFLOW_RUN: "⚙️",
+    SignalType.RELEASE: "🚀",
+    SignalType.COMMENT: "💬",
+    # Salesforce
+    SignalType.RECORD_CREATED: "➕",
+    SignalType.RECORD_UPDATED: "📝",
+    SignalType.RECORD_DELETED: "🗑️",
+    # Stripe
+    SignalType.PAYMENT_RECEIVED: "💰",
+    SignalType.PAYMENT_FAILED: "❌",
+    SignalType.SUBSCRIPTION_CREATED: "📦",
+    SignalType.SUBSCRIPTION_CANCELLED: "📦",
+    SignalType.INVOICE_PAID: "🧾",
+    # Cloudflare
+    SignalType.WORKER_DEPLOYED: "🌐",
+    SignalType.TRAFFIC_SPIKE: "📈",
+    SignalType.ERROR_RATE_HIGH: "⚠️",
+    # Slack
+    SignalType.SLASH_COMMAND: "⌨️",
+    SignalType.MESSAGE: "💬",
+    # Google
+    SignalType.FILE_CREATED: "📄",
+    SignalType.FILE_MODIFIED: "📝",
+    SignalType.FILE_DELETED: "🗑️",
+    # Figma
+    SignalType.DESIGN_UPDATED: "🎨",
+    SignalType.COMMENT_ADDED: "💬",
+    # Generic
+    SignalType.CUSTOM: "📡",
+    SignalType.PING: "🏓",
+    SignalType.ERROR: "❌",
+})
+
+
+# (epoch second, formatted prefix) reused until the second rolls over
+_ts_cache = (-1, "")
+
+
+def utc_now_iso() -> str:
+    """Current UTC time in datetime.utcnow().isoformat() form."""
+    global _ts_cache
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{ns // 1000:06d}"
+
+
+def _signal_id(content: str) -> str:
+    """Short opaque signal id (not security sensitive)."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(content.encode())[:12]
+    return hashlib.blake2b(content.encode(), digest_size=6).hexdigest()
+
+
+@dataclass(slots=True)
+class SignalData(Mapping):
+    """
+    Base for fixed-shape signal payloads.
+
+    Slotted subclasses are cheaper to build than dicts and are read-only
+    Mappings (in, len, iteration, items, get, []), so consumers can treat
+    them like the dict payloads of other handlers. Use to_dict() or
+    dict() where a real dict is needed, e.g. json.dumps.
+    """
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__match_args__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__match_args__)
+
+    def __len__(self) -> int:
+        return len(self.__match_args__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.__match_args__}
+
+
 @dataclass
 class Signal:
     """
@@ -117,65 +215,31 @@ class Signal:
     type: SignalType
     source: str                    # Provider name (github, stripe, etc.)
     target: str                    # Target org code (OS, FND, AI, etc.)
-    data: Dict[str, Any] = field(default_factory=dict)
+    data: Union[Dict[str, Any], SignalData] = field(default_factory=dict)
     timestamp: str = ""
     id: str = ""
     raw: Optional[Dict[str, Any]] = None  # Original webhook payload
 
     def __post_init__(self):
         if not self.timestamp:
-            self.timestamp = datetime.utcnow().isoformat()
+            self.timestamp = utc_now_iso()
         if not self.id:
-            import hashlib
-            content = f"{self.type.value}{self.source}{self.timestamp}"
-            self.id = hashlib.sha256(content.encode()).hexdigest()[:12]
+            self.id = _signal_id(f"{self.type.value}{self.source}{self.timestamp}")
 
     def format(self) -> str:
         """Format as BlackRoad signal string."""
         emoji = self._get_emoji()
-        data_str = ", ".join(f"{k}={v}" for k, v in list(self.data.items())[:3])
-        return f"{emoji} {self.source.upper()} → {self.target} : {self.type.value}, {data_str}"
+        # First three fields, without copying the full items list
+        parts = []
+        for k, v in self.data.items():
+            if len(parts) == 3:
+                break
+            parts.append(f"{k}={v}")
+        return f"{emoji} {self.source.upper()} → {self.target} : {self.type.value}, {', '.join(parts)}"
 
     def _get_emoji(self) -> str:
         """Get emoji for signal type."""
-        emoji_map = {
-            # GitHub
-            SignalType.PUSH: "📥",
-            SignalType.PULL_REQUEST: "🔀",
-            SignalType.ISSUE: "📝",
-            SignalType.WORKFLOW_RUN: "⚙️",
-            SignalType.RELEASE: "🚀",
-            SignalType.COMMENT: "💬",
-            # Salesforce
-            SignalType.RECORD_CREATED: "➕",
-            SignalType.RECORD_UPDATED: "📝",
-            SignalType.RECORD_DELETED: "🗑️",
-            # Stripe
-            SignalType.PAYMENT_RECEIVED: "💰",
-            SignalType.PAYMENT_FAILED: "❌",
-            SignalType.SUBSCRIPTION_CREATED: "📦",
-            SignalType.SUBSCRIPTION_CANCELLED: "📦",
-            SignalType.INVOICE_PAID: "🧾",
-            # Cloudflare
-            SignalType.WORKER_DEPLOYED: "🌐",
-            SignalType.TRAFFIC_SPIKE: "📈",
-            SignalType.ERROR_RATE_HIGH: "⚠️",
-            # Slack
-            SignalType.SLASH_COMMAND: "⌨️",
-            SignalType.MESSAGE: "💬",
-            # Google
-            SignalType.FILE_CREATED: "📄",
-            SignalType.FILE_MODIFIED: "📝",
-            SignalType.FILE_DELETED: "🗑️",
-            # Figma
-            SignalType.DESIGN_UPDATED: "🎨",
-            SignalType.COMMENT_ADDED: "💬",
-            # Generic
-            SignalType.CUSTOM: "📡",
-            SignalType.PING: "🏓",
-            SignalType.ERROR: "❌",
-        }
-        return emoji_map.get(self.type, "📡")
+        return _SIGNAL_EMOJI.get(self.type, "📡")
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -184,11 +248,15 @@ class Signal:
             "type": self.type.value,
             "source": self.source,
             "target": self.target,
-            "data": self.data,
+            "data": self.data if isinstance(self.data, dict) else dict(self.data),
             "timestamp": self.timestamp,
             "formatted": self.format(),
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes."""
+        return codec.dumps(self.to_dict())
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Signal":
         """Create from dictionary."""
@@ -24,11 +24,38 @@ Usage:
 
 __version__ = "0.1.0"
 
-from .routing.router import Router, Route, RouteResult
-from .routing.strategy import RoutingStrategy, CostOptimized, LatencyOptimized, QualityOptimized
-from .providers.base import Provider, ProviderConfig, ModelCapability
-from .tracking.costs import CostTracker
-from .signals.emitter import SignalEmitter
+import importlib
+
+# Public names resolve on first access (PEP 562), so `import ai_router`
+# and the CLI's --help don't pull in the routing and provider modules.
+_LAZY = {
+    "Router": ".routing.router",
+    "Route": ".routing.router",
+    "RouteResult": ".routing.router",
+    "RoutingStrategy": ".routing.strategy",
+    "CostOptimized": ".routing.strategy",
+    "LatencyOptimized": ".routing.strategy",
+    "QualityOptimized": ".routing.strategy",
+    "Provider": ".providers.base",
+    "ProviderConfig": ".providers.base",
+    "ModelCapability": ".providers.base",
+    "CostTracker": ".tracking.costs",
+    "SignalEmitter": ".signals.emitter",
+    "SemanticCache": ".caching.semantic",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(__all__) | {"__version__"})
+
 
 __all__ = [
     "Router",
@@ -43,4 +70,5 @@ __all__ = [
     "ModelCapability",
     "CostTracker",
     "SignalEmitter",
+    "SemanticCache",
 ]
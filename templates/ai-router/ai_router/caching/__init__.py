@@ -0,0 +1,5 @@
+"""Response caching in front of providers."""
+
+from .semantic import SemanticCache
+
+__all__ = ["SemanticCache"]
@@ -0,0 +1,168 @@
+"""
+Semantic Cache - Answer near-duplicate prompts without calling a model.
+
+Prompts are embedded and compared by cosine similarity with earlier
+prompts for the same model, route, system prompt and generation
+settings. A close enough match returns the stored
+response instead of running inference again.
+"""
+
+import hashlib
+import math
+import operator
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ..providers.base import CompletionRequest, CompletionResponse
+
+
+class SemanticCache:
+    """
+    Similarity cache for completions.
+
+    Vectors are stored unit-normalized in one preallocated matrix per
+    partition (see key()), so a lookup is a single matrix-vector
+    product (pure Python without numpy) and an insert copies one row.
+    With quantize=True and numpy installed, rows are kept as int8 with a
+    per-row scale, a quarter of the float32 footprint.
+
+    Usage:
+        cache = SemanticCache(threshold=0.86)
+        provider = OllamaProvider(semantic_cache=cache)
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.86,
+        max_entries: int = 512,
+        quantize: bool = False,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Entries kept per partition (oldest evicted first)
+            quantize: Store vectors as int8 (numpy only)
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.quantize = quantize and np is not None
+        self._vectors: Dict[str, Any] = {}
+        self._scales: Dict[str, Any] = {}
+        self._responses: Dict[str, List[CompletionResponse]] = {}
+        self._next: Dict[str, int] = {}  # oldest slot, once a partition is full
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, request: CompletionRequest, route: str = "") -> str:
+        """
+        Partition for a request: only the user turns are compared by
+        similarity, so everything else that shapes the answer must match.
+
+        Args:
+            model: Model the request runs on ("" if not pinned)
+            request: The request
+            route: Pinned provider or fallback chain, if any
+        """
+        context = "\0".join(
+            f"{m.role}:{m.content}" for m in request.messages if m.role != "user"
+        )
+        digest = hashlib.blake2b(context.encode(), digest_size=8).hexdigest()
+        return (
+            f"{model}|{route}|{request.max_tokens}|{request.temperature}"
+            f"|{request.stop}|{digest}"
+        )
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]):
+        if np is not None:
+            v = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(v)
+            return v / norm if norm else v
+        norm = math.sqrt(sum(x * x for x in vector))
+        return [x / norm for x in vector] if norm else list(vector)
+
+    def lookup(
+        self, key: str, vector: Sequence[float]
+    ) -> Optional[CompletionResponse]:
+        """Return the stored response closest to vector, if close enough."""
+        responses = self._responses.get(key)
+        if responses:
+            n = len(responses)
+            query = self._normalize(vector)
+            stored = self._vectors[key]
+            if np is not None:
+                scores = stored[:n] @ query
+                if self.quantize:
+                    scores *= self._scales[key][:n]
+                best = int(scores.argmax())
+                score = float(scores[best])
+            else:
+                score, best = max(
+                    (sum(map(operator.mul, row, query)), i)
+                    for i, row in enumerate(stored)
+                )
+            if score >= self.threshold:
+                self.hits += 1
+                return responses[best]
+
+        self.misses += 1
+        return None
+
+    def add(self, key: str, vector: Sequence[float], response: CompletionResponse):
+        """Remember a response under its prompt vector."""
+        v = self._normalize(vector)
+        responses = self._responses.setdefault(key, [])
+        n = len(responses)
+
+        if n < self.max_entries:
+            slot = n
+            responses.append(response)
+        else:
+            # Full: overwrite the oldest entry in place
+            slot = self._next.get(key, 0)
+            self._next[key] = (slot + 1) % self.max_entries
+            responses[slot] = response
+
+        if np is None:
+            stored = self._vectors.setdefault(key, [])
+            if slot == len(stored):
+                stored.append(v)
+            else:
+                stored[slot] = v
+            return
+
+        scale = None
+        if self.quantize:
+            # Symmetric int8: v ~= row * scale
+            scale = np.float32(np.abs(v).max() / 127) or np.float32(1)
+            v = np.round(v / scale).astype(np.int8)
+
+        stored = self._vectors.get(key)
+        if stored is None or slot == len(stored):
+            # Preallocated rows, capacity doubling up to max_entries
+            capacity = min(max(16, 2 * slot), self.max_entries)
+            grown = np.empty((capacity, len(v)), dtype=v.dtype)
+            scales = np.empty(capacity, dtype=np.float32)
+            if stored is not None:
+                grown[:slot] = stored
+                if self.quantize:
+                    scales[:slot] = self._scales[key]
+            self._vectors[key] = stored = grown
+            self._scales[key] = scales
+        stored[slot] = v
+        if self.quantize:
+            self._scales[key][slot] = scale
+
+    def clear(self):
+        """Drop all cached responses."""
+        self._vectors.clear()
+        self._scales.clear()
+        self._responses.clear()
+        self._next.clear()
@@ -15,13 +15,47 @@ Usage:
 
 import asyncio
 import argparse
+import logging
+import logging.handlers
+import queue
 import sys
+import time
 from typing import Optional
 
+try:
+    import uvloop  # Faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
 
-def run_async(coro):
-    """Run an async function."""
-    return asyncio.get_event_loop().run_until_complete(coro)
+
+_STATUS_EMOJI = {"healthy": "🟢", "degraded": "🟡", "unavailable": "🔴"}
+
+
+def _run(coro):
+    """asyncio.run(), on uvloop when it is installed."""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
+
+
+def _start_signal_logging() -> logging.handlers.QueueListener:
+    """
+    Show router signals on stdout.
+
+    Records go through a queue and are formatted and written by the
+    listener's thread, keeping stdout off the event loop.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("  %(message)s"))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+
+    logger = logging.getLogger("ai_router")
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    return listener
 
 
 async def cmd_complete(args):
@@ -51,13 +85,13 @@ async def cmd_complete(args):
         max_tokens=args.max_tokens,
         temperature=args.temperature,
     )
+    await router.close()
 
     if result.success:
         print(f"  Response ({result.final_provider}):")
         print()
         # Indent response
-        for line in result.content.split("\n"):
-            print(f"    {line}")
+        sys.stdout.write("    " + result.content.replace("\n", "\n    ") + "\n")
         print()
         print("  " + "-" * 50)
         print(f"  Latency: {result.total_latency_ms}ms")
@@ -84,13 +118,30 @@ async def cmd_stream(args):
     print("  Response:")
     print("  ", end="", flush=True)
 
+    # Coalesce small chunks: flush at 64 chars or every 50ms, whichever first
+    pending = []
+    pending_len = 0
+    last_flush = time.monotonic()
+
     async for chunk in router.complete_stream(
         args.prompt,
         provider=args.provider,
         max_tokens=args.max_tokens,
         temperature=args.temperature,
     ):
-        print(chunk, end="", flush=True)
+        pending.append(chunk)
+        pending_len += len(chunk)
+        now = time.monotonic()
+        if pending_len >= 64 or now - last_flush >= 0.05:
+            sys.stdout.write("".join(pending))
+            sys.stdout.flush()
+            pending.clear()
+            pending_len = 0
+            last_flush = now
+
+    if pending:
+        sys.stdout.write("".join(pending))
+    await router.close()
 
     print()
     print()
@@ -106,6 +157,7 @@ async def cmd_embed(args):
     print(f"  Text: {args.text[:60]}{'...' if len(args.text) > 60 else ''}")
 
     result = await router.embed(args.text, provider=args.provider)
+    await router.close()
 
     print(f"  Provider: {result.provider}")
     print(f"  Model: {result.model}")
@@ -119,11 +171,13 @@ async def cmd_embed(args):
         print()
 
 
-async def cmd_health(args):
+async def cmd_health(args, router=None):
     """Check provider health."""
     from .routing.router import Router
 
-    router = Router()
+    owned = router is None
+    if owned:
+        router = Router()
 
     print()
     print("  PROVIDER HEALTH")
@@ -131,10 +185,13 @@ async def cmd_health(args):
     print()
 
     results = await router.health_check_all()
+    if owned:
+        await router.close()
 
-    for provider, status in results.items():
-        emoji = "🟢" if status.value == "healthy" else "🟡" if status.value == "degraded" else "🔴"
-        print(f"  {emoji} {provider:15} {status.value}")
+    print("\n".join(
+        f"  {_STATUS_EMOJI.get(status.value, '🔴')} {provider:15} {status.value}"
+        for provider, status in results.items()
+    ))
 
     print()
 
@@ -172,6 +229,10 @@ def cmd_interactive(args):
     provider = None
     strategy = args.strategy
 
+    # One loop for the whole session so provider clients keep their
+    # connection pools between prompts.
+    loop = _new_event_loop()
+
     while True:
         try:
             prompt = input("  > ").strip()
@@ -191,16 +252,20 @@ def cmd_interactive(args):
                     print(f"  Provider set to: {provider or 'auto'}")
                 elif cmd == "strategy":
                     strategy = parts[1] if len(parts) > 1 else "cost"
-                    router = Router(strategy=strategy)
+                    try:
+                        router.set_strategy(strategy)
+                    except ValueError as e:
+                        print(f"  {e}")
+                        continue
                     print(f"  Strategy set to: {strategy}")
                 elif cmd == "health":
-                    run_async(cmd_health(args))
+                    loop.run_until_complete(cmd_health(args, router))
                 else:
                     print(f"  Unknown command: {cmd}")
                 continue
 
             # Run completion
-            result = run_async(router.complete(prompt, provider=provider))
+            result = loop.run_until_complete(router.complete(prompt, provider=provider))
 
             if result.success:
                 print()
@@ -213,6 +278,9 @@ def cmd_interactive(args):
             print("\n  Goodbye!")
             break
 
+    loop.run_until_complete(router.close())
+    loop.close()
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -274,20 +342,24 @@ Examples:
 
     args = parser.parse_args()
 
-    if args.command == "complete":
-        run_async(cmd_complete(args))
-    elif args.command == "stream":
-        run_async(cmd_stream(args))
-    elif args.command == "embed":
-        run_async(cmd_embed(args))
-    elif args.command == "health":
-        run_async(cmd_health(args))
-    elif args.command == "costs":
-        cmd_costs(args)
-    elif args.command == "interactive":
-        cmd_interactive(args)
-    else:
-        parser.print_help()
+    listener = _start_signal_logging()
+    try:
+        if args.command == "complete":
+            _run(cmd_complete(args))
+        elif args.command == "stream":
+            _run(cmd_stream(args))
+        elif args.command == "embed":
+            _run(cmd_embed(args))
+        elif args.command == "health":
+            _run(cmd_health(args))
+        elif args.command == "costs":
+            cmd_costs(args)
+        elif args.command == "interactive":
+            cmd_interactive(args)
+        else:
+            parser.print_help()
+    finally:
+        listener.stop()  # Flushes queued signals
 
 
 if __name__ == "__main__":
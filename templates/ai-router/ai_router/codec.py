@@ -0,0 +1,32 @@
+"""
+JSON codec for provider HTTP payloads.
+
+Uses orjson when it is installed (parses bytes directly, much faster
+dumps) and falls back to the standard library otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Headers for a request body produced by dumps()
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def loads(data: bytes) -> Any:
+    """Decode a JSON document from raw bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object as JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
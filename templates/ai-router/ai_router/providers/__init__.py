@@ -1,10 +1,30 @@
 """AI Providers - Unified interface to multiple AI backends."""
 
+import importlib
+
 from .base import Provider, ProviderConfig, ModelCapability, ProviderStatus
-from .openai import OpenAIProvider
-from .anthropic import AnthropicProvider
-from .hailo import HailoProvider
-from .ollama import OllamaProvider
+
+# Concrete providers are imported on first access (PEP 562) so that
+# touching one backend doesn't load the others.
+_LAZY = {
+    "OpenAIProvider": ".openai",
+    "AnthropicProvider": ".anthropic",
+    "HailoProvider": ".hailo",
+    "OllamaProvider": ".ollama",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(__all__)
+
 
 __all__ = [
     "Provider",
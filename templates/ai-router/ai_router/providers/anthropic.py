@@ -4,8 +4,12 @@ Anthropic Provider - Claude 3.5 Sonnet, Claude 3 Opus, and more.
 The thoughtful alternative. Great for reasoning and code.
 """
 
+import asyncio
+import base64
 import os
 import time
+from collections import OrderedDict
+from dataclasses import replace
 from typing import Optional, AsyncIterator, Dict, Any, List
 
 from .base import (
@@ -16,6 +20,7 @@ from .base import (
     CompletionRequest,
     CompletionResponse,
     Message,
+    image_media_type,
 )
 
 
@@ -60,6 +65,42 @@ ANTHROPIC_MODELS = {
 }
 
 
+# (input, output) $ per token, flattened once for the completion hot path
+_MODEL_COST_PER_TOKEN = {
+    model: (info["cost_input"] / 1000, info["cost_output"] / 1000)
+    for model, info in ANTHROPIC_MODELS.items()
+}
+
+
+def _encode_image(raw: bytes) -> str:
+    """Base64-encode raw image bytes (run off the event loop)."""
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _http_client():
+    """
+    httpx client for the SDK with long-lived keep-alive connections.
+
+    Uses HTTP/2 when the optional h2 package is installed.
+    """
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=64,
+            max_keepalive_connections=32,
+            keepalive_expiry=30,
+        ),
+    )
+
+
 def default_config() -> ProviderConfig:
     """Default Anthropic configuration."""
     return ProviderConfig(
@@ -95,9 +136,16 @@ class AnthropicProvider(Provider):
         response = await provider.complete(request)
     """
 
+    # Seconds a health probe result is reused before probing again
+    HEALTH_TTL = 15.0
+
+    # Deterministic (temperature 0) responses kept for identical requests
+    RESPONSE_CACHE_SIZE = 256
+
     def __init__(self, config: Optional[ProviderConfig] = None):
         super().__init__(config or default_config())
         self._client = None
+        self._response_cache: "OrderedDict[tuple, CompletionResponse]" = OrderedDict()
 
     @property
     def client(self):
@@ -109,19 +157,30 @@ class AnthropicProvider(Provider):
                     api_key=self.config.api_key,
                     timeout=self.config.timeout,
                     max_retries=self.config.max_retries,
+                    http_client=_http_client(),
                 )
             except ImportError:
                 raise ImportError("anthropic package required: pip install anthropic")
         return self._client
 
-    def _format_messages(self, messages: List[Message]) -> tuple:
+    async def close(self):
+        """Close the SDK client and its connection pool."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _format_messages(self, messages: List[Message]) -> tuple:
         """
         Convert our Message format to Anthropic format.
 
+        Raw image bytes are base64-encoded in the default executor, all
+        images at once, so large payloads don't stall other requests.
+
         Returns (system_prompt, messages_list)
         """
         system_prompt = None
         formatted = []
+        pending = []  # (source, future) for raw image bytes
 
         for msg in messages:
             if msg.role == "system":
@@ -136,9 +195,18 @@ class AnthropicProvider(Provider):
             if msg.images:
                 content = []
                 for img in msg.images:
-                    if img.startswith("http"):
-                        # Anthropic requires base64 for images
-                        # In production, you'd fetch and encode
+                    if isinstance(img, bytes):
+                        source = {
+                            "type": "base64",
+                            "media_type": image_media_type(img),
+                            "data": None,
+                        }
+                        future = asyncio.get_running_loop().run_in_executor(
+                            None, _encode_image, img
+                        )
+                        pending.append((source, future))
+                        content.append({"type": "image", "source": source})
+                    elif img.startswith("http"):
                         content.append({
                             "type": "image",
                             "source": {
@@ -151,7 +219,7 @@ class AnthropicProvider(Provider):
                             "type": "image",
                             "source": {
                                 "type": "base64",
-                                "media_type": "image/jpeg",
+                                "media_type": image_media_type(img),
                                 "data": img,
                             }
                         })
@@ -162,14 +230,45 @@ class AnthropicProvider(Provider):
 
             formatted.append(entry)
 
+        if pending:
+            encoded = await asyncio.gather(*(future for _, future in pending))
+            for (source, _), data in zip(pending, encoded):
+                source["data"] = data
+
         return system_prompt, formatted
 
+    @staticmethod
+    def _cache_key(model: str, request: CompletionRequest) -> tuple:
+        """Exact identity of a request, for the deterministic response cache."""
+        return (
+            model,
+            request.max_tokens,
+            tuple(request.stop) if request.stop else None,
+            tuple(
+                (m.role, m.content, m.name, tuple(m.images) if m.images else None)
+                for m in request.messages
+            ),
+        )
+
     async def complete(self, request: CompletionRequest) -> CompletionResponse:
-        """Generate a chat completion."""
+        """
+        Generate a chat completion.
+
+        Requests with temperature 0 are deterministic, so repeats are
+        answered from an in-memory LRU without calling the API.
+        """
         model = request.model or self.config.default_model
         start_time = time.time()
 
-        system_prompt, messages = self._format_messages(request.messages)
+        key = None
+        if request.temperature == 0:
+            key = self._cache_key(model, request)
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+                return replace(cached, cost=0.0, latency_ms=0)
+
+        system_prompt, messages = await self._format_messages(request.messages)
 
         try:
             kwargs = {
@@ -194,20 +293,20 @@ class AnthropicProvider(Provider):
             output_tokens = response.usage.output_tokens
 
             # Calculate cost based on model
-            model_info = ANTHROPIC_MODELS.get(model, {})
-            cost_input = model_info.get("cost_input", self.config.cost_per_1k_input)
-            cost_output = model_info.get("cost_output", self.config.cost_per_1k_output)
-            cost = (input_tokens / 1000 * cost_input) + (output_tokens / 1000 * cost_output)
+            cost_input, cost_output = _MODEL_COST_PER_TOKEN.get(model) or (
+                self._input_rate,
+                self._output_rate,
+            )
+            cost = cost_input * input_tokens + cost_output * output_tokens
 
             # Extract content
-            content = ""
-            for block in response.content:
-                if hasattr(block, "text"):
-                    content += block.text
+            content = "".join(
+                block.text for block in response.content if hasattr(block, "text")
+            )
 
             self.record_success()
 
-            return CompletionResponse(
+            result = CompletionResponse(
                 content=content,
                 model=model,
                 provider=self.name,
@@ -217,9 +316,16 @@ class AnthropicProvider(Provider):
                 cost=cost,
                 latency_ms=latency_ms,
                 finish_reason=response.stop_reason,
-                raw_response=response.model_dump(),
+                raw=response,
             )
 
+            if key is not None:
+                self._response_cache[key] = result
+                if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+
+            return result
+
         except Exception as e:
             self.record_error()
             raise
@@ -230,7 +336,7 @@ class AnthropicProvider(Provider):
         """Stream a chat completion."""
         model = request.model or self.config.default_model
 
-        system_prompt, messages = self._format_messages(request.messages)
+        system_prompt, messages = await self._format_messages(request.messages)
 
         try:
             kwargs = {
@@ -256,17 +362,30 @@ class AnthropicProvider(Provider):
             self.record_error()
             raise
 
+    async def warmup(self):
+        """Import the SDK and build the client outside the request path."""
+        try:
+            self.client
+        except ImportError:
+            pass
+
     async def health_check(self) -> ProviderStatus:
-        """Check if Anthropic is reachable."""
+        """Check if Anthropic is reachable (cached for HEALTH_TTL seconds)."""
+        return await self._cached_health(self._probe_health)
+
+    async def _probe_health(self) -> ProviderStatus:
         try:
-            # Quick completion test
-            await self.client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=1,
-                messages=[{"role": "user", "content": "hi"}],
-            )
-            self._status = ProviderStatus.HEALTHY
+            models = getattr(self.client, "models", None)
+            if models is not None:
+                # Models list call - authenticated but not billed
+                await models.list(limit=1)
+            else:
+                # SDKs before models.list (anthropic<0.39): quick completion
+                await self.client.messages.create(
+                    model="claude-3-haiku-20240307",
+                    max_tokens=1,
+                    messages=[{"role": "user", "content": "hi"}],
+                )
+            return ProviderStatus.HEALTHY
         except Exception:
-            self._status = ProviderStatus.UNAVAILABLE
-
-        return self._status
+            return ProviderStatus.UNAVAILABLE
@@ -4,12 +4,109 @@ Base Provider - Abstract interface for all AI providers.
 All providers implement this interface, making them interchangeable.
 """
 
+import asyncio
+import base64
+import binascii
+import hashlib
+import re
+import string
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import InitVar, dataclass, field, replace
 from enum import Enum
-from typing import Optional, List, Dict, Any, AsyncIterator
+from functools import lru_cache
+from typing import (
+    Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, FrozenSet,
+    Iterable, Set, Tuple, Union, TYPE_CHECKING,
+)
 from datetime import datetime
 
+from .. import codec
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ..caching.semantic import SemanticCache
+
+
+# (epoch second, formatted prefix) reused until the second rolls over
+_ts_cache = (-1, "")
+
+
+def utc_now_iso() -> str:
+    """Current UTC time in datetime.utcnow().isoformat() form."""
+    global _ts_cache
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{ns // 1000:06d}"
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """numpy if installed, else None; imported on the first embedding call."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def image_media_type(image: Union[str, bytes]) -> str:
+    """
+    MIME type of an image from its magic bytes.
+
+    Accepts raw bytes or a base64 string; anything unrecognized is
+    reported as image/jpeg.
+    """
+    head = image[:16]
+    if isinstance(head, str):
+        try:
+            head = base64.b64decode(head)
+        except (binascii.Error, ValueError):
+            return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+
+# Placeholder markers as they appear in a serialized template body
+# (NUL-delimited in the message text, which JSON escapes as \u0000).
+# Field names are ASCII identifiers, matching _mark_placeholders.
+_PLACEHOLDER = re.compile(rb"\\u0000([A-Za-z_][A-Za-z0-9_]*)\\u0000")
+
+
+def _mark_placeholders(content: str, variables: Optional[Set[str]]) -> str:
+    """
+    Replace str.format-style {name} fields in content with NUL markers.
+
+    {{ and }} are literal braces. Raises ValueError for malformed fields
+    or names that aren't ASCII identifiers, and for names outside
+    variables (if given).
+    """
+    out = []
+    for literal, name, spec, conversion in string.Formatter().parse(content):
+        out.append(literal)
+        if name is None:
+            continue
+        if not (name.isidentifier() and name.isascii()) or spec or conversion:
+            raise ValueError(
+                f"Unsupported template field {{{name}}}; use {{{{ and }}}} for literal braces"
+            )
+        if variables is not None and name not in variables:
+            raise ValueError(
+                f"Unknown template field {{{name}}}; use {{{{{name}}}}} for literal braces"
+            )
+        out.append(f"\x00{name}\x00")
+    return "".join(out)
+
 
 class ModelCapability(Enum):
     """What a model can do."""
@@ -31,7 +128,18 @@ class ProviderStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Status after N outstanding errors (None = leave unchanged)
+_ERROR_LADDER = (
+    None,
+    None,
+    None,
+    ProviderStatus.DEGRADED,
+    ProviderStatus.DEGRADED,
+    ProviderStatus.UNAVAILABLE,
+)
+
+
+@dataclass(slots=True)
 class ProviderConfig:
     """Configuration for a provider."""
     name: str
@@ -50,23 +158,27 @@ class ProviderConfig:
     avg_latency_ms: int = 500         # Expected latency
     max_tokens: int = 4096            # Max context
 
-    # Capabilities
-    capabilities: List[ModelCapability] = field(default_factory=list)
+    # Capabilities (any iterable; stored as a frozenset)
+    capabilities: Iterable[ModelCapability] = field(default_factory=frozenset)
 
     # Extra config
     extra: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self):
+        # Set membership keeps supports() a single hash lookup
+        self.capabilities = frozenset(self.capabilities)
+
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """A message in a conversation."""
     role: str           # system, user, assistant
     content: str
     name: Optional[str] = None
-    images: Optional[List[str]] = None  # Base64 or URLs for vision
+    images: Optional[List[Union[str, bytes]]] = None  # Base64, URLs or raw bytes for vision
 
 
-@dataclass
+@dataclass(slots=True)
 class CompletionRequest:
     """Request for completion/chat."""
     messages: List[Message]
@@ -82,7 +194,7 @@ class CompletionRequest:
     max_cost: Optional[float] = None  # Max $ to spend
 
 
-@dataclass
+@dataclass(slots=True)
 class CompletionResponse:
     """Response from completion/chat."""
     content: str
@@ -99,24 +211,48 @@ class CompletionResponse:
 
     # Timing
     latency_ms: int = 0
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = field(default_factory=utc_now_iso)
 
     # Metadata
     finish_reason: Optional[str] = None
-    raw_response: Optional[Dict[str, Any]] = None
+    raw: Any = field(default=None, repr=False)  # SDK object or parsed JSON
+
+    # Older name for raw, still accepted by the constructor
+    raw_response: InitVar[Any] = None
+
+    def __post_init__(self, raw_response: Any):
+        if raw_response is not None and self.raw is None:
+            self.raw = raw_response
+
 
+def _raw_response(self: CompletionResponse) -> Optional[Dict[str, Any]]:
+    """Provider response as a dict, serialized on first access."""
+    if hasattr(self.raw, "model_dump"):
+        self.raw = self.raw.model_dump()
+    return self.raw
 
-@dataclass
+
+# Set after the class body: a property there would become the InitVar default
+CompletionResponse.raw_response = property(_raw_response)
+
+
+@dataclass(slots=True)
 class EmbeddingRequest:
     """Request for embeddings."""
     texts: List[str]
     model: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddingResponse:
-    """Response with embeddings."""
-    embeddings: List[List[float]]
+    """
+    Response with embeddings.
+
+    embeddings is one list of floats per text. Providers configured with
+    extra["embeddings_as_array"] return a float32 (n, dimensions) ndarray
+    instead, when numpy is installed.
+    """
+    embeddings: Union[List[List[float]], "np.ndarray"]
     model: str
     provider: str
     dimensions: int
@@ -135,12 +271,34 @@ class Provider(ABC):
     - health_check(): Check if provider is available
     """
 
-    def __init__(self, config: ProviderConfig):
+    # Seconds a health probe result is reused (0 = probe every time)
+    HEALTH_TTL = 0.0
+
+    def __init__(
+        self,
+        config: ProviderConfig,
+        semantic_cache: Optional["SemanticCache"] = None,
+    ):
         self.config = config
         self.name = config.name
+        self.semantic_cache = semantic_cache
         self._status = ProviderStatus.UNKNOWN
         self._last_check: Optional[datetime] = None
         self._error_count = 0
+        self._checked_at: Optional[float] = None
+        self._probe_lock = asyncio.Lock()
+
+        # $ per token, derived once from the per-1k config prices
+        self._input_rate = config.cost_per_1k_input / 1000
+        self._output_rate = config.cost_per_1k_output / 1000
+
+        # Embedding LRU: (model, text digest) -> vector
+        self._embed_cache: "OrderedDict[Tuple[str, bytes], List[float]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Compiled templates: name -> (model, body split at placeholders)
+        self._templates: Dict[str, Tuple[str, List[bytes]]] = {}
 
     @property
     def status(self) -> ProviderStatus:
@@ -153,7 +311,7 @@ class Provider(ABC):
         return self._status in (ProviderStatus.HEALTHY, ProviderStatus.DEGRADED)
 
     @property
-    def capabilities(self) -> List[ModelCapability]:
+    def capabilities(self) -> FrozenSet[ModelCapability]:
         """What this provider can do."""
         return self.config.capabilities
 
@@ -189,6 +347,62 @@ class Provider(ABC):
         """
         pass
 
+    def compile_template(
+        self,
+        name: str,
+        request: CompletionRequest,
+        variables: Optional[Iterable[str]] = None,
+    ):
+        """
+        Pre-serialize a request that is reused with different values.
+
+        Message contents may hold {field} placeholders, with {{ and }}
+        for literal braces as in str.format. The payload is encoded once;
+        complete_template() then splices values into the stored bytes
+        (str() of each, JSON-escaped) instead of rebuilding the request.
+
+        Args:
+            name: Template name
+            request: Request whose message contents hold the placeholders
+            variables: Expected field names; any other field is an error
+        """
+        expected = set(variables) if variables is not None else None
+        marked = replace(request, messages=[
+            replace(m, content=_mark_placeholders(m.content, expected))
+            for m in request.messages
+        ])
+        model = request.model or self.config.default_model
+        body = codec.dumps(self._request_payload(marked))
+        self._templates[name] = (model, _PLACEHOLDER.split(body))
+
+    def _render_template(self, name: str, variables: Dict[str, str]) -> Tuple[str, bytes]:
+        """Return (model, body) for a compiled template."""
+        model, parts = self._templates[name]
+        # split() alternates literal bytes and placeholder names
+        return model, b"".join(
+            part if i % 2 == 0 else codec.dumps(str(variables[part.decode()]))[1:-1]
+            for i, part in enumerate(parts)
+        )
+
+    def _request_payload(self, request: CompletionRequest) -> Dict[str, Any]:
+        """Backend request body for a completion (needed for templates)."""
+        raise NotImplementedError(f"{self.name} does not support compiled templates")
+
+    async def complete_template(
+        self, name: str, variables: Dict[str, str]
+    ) -> CompletionResponse:
+        """
+        Complete a template registered with compile_template().
+
+        Args:
+            name: Template name
+            variables: Values for the template's placeholders
+
+        Returns:
+            CompletionResponse (the semantic cache is not consulted)
+        """
+        raise NotImplementedError(f"{self.name} does not support compiled templates")
+
     async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
         """
         Generate embeddings for text.
@@ -201,6 +415,121 @@ class Provider(ABC):
         """
         raise NotImplementedError(f"{self.name} does not support embeddings")
 
+    def _cached_embeddings(
+        self, model: str, texts: List[str]
+    ) -> Tuple[List[Optional[List[float]]], List[int]]:
+        """
+        Look texts up in the embedding cache.
+
+        Returns (vectors, misses): one slot per text, None where not cached,
+        and the indices that still need embedding.
+        """
+        cache = self._embed_cache
+        vectors: List[Optional[List[float]]] = []
+        misses = []
+        for i, text in enumerate(texts):
+            key = (model, hashlib.blake2b(text.encode(), digest_size=16).digest())
+            vector = cache.get(key)
+            if vector is None:
+                misses.append(i)
+            else:
+                cache.move_to_end(key)
+            vectors.append(vector)
+
+        self.cache_hits += len(texts) - len(misses)
+        self.cache_misses += len(misses)
+        return vectors, misses
+
+    def _cache_embeddings(
+        self,
+        model: str,
+        texts: List[str],
+        vectors: List[Optional[List[float]]],
+        misses: List[int],
+        fresh: List[List[float]],
+    ):
+        """
+        Fill the missed slots with fresh vectors and remember them.
+
+        Raises ValueError if the backend returned fewer vectors than
+        texts. Empty or short vectors are returned but never cached, so
+        a bad response doesn't stick to a text.
+        """
+        if len(fresh) != len(misses):
+            raise ValueError(
+                f"Expected {len(misses)} embeddings from {self.name}, got {len(fresh)}"
+            )
+
+        cache = self._embed_cache
+        limit = self.config.extra.get("cache_size", 2048)
+        dimensions = max(map(len, fresh), default=0)
+        np = _numpy()
+        for i, vector in zip(misses, fresh):
+            vectors[i] = vector
+            if not vector or len(vector) < dimensions:
+                continue
+            if np is not None:
+                # float32 rows: half the memory of float lists
+                vector = np.asarray(vector, dtype=np.float32)
+            key = (model, hashlib.blake2b(texts[i].encode(), digest_size=16).digest())
+            cache[key] = vector
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+    def _embedding_matrix(self, vectors: List[Any]) -> Union[List[List[float]], "np.ndarray"]:
+        """
+        Per-text vectors in the response type: lists of floats, or one
+        float32 matrix with extra["embeddings_as_array"] and numpy.
+        """
+        np = _numpy()
+        if np is not None and self.config.extra.get("embeddings_as_array"):
+            return np.asarray(vectors, dtype=np.float32)
+        return [v.tolist() if hasattr(v, "tolist") else v for v in vectors]
+
+    async def _semantic_lookup(
+        self, key: str, request: CompletionRequest
+    ) -> Tuple[Optional[List[float]], Optional[CompletionResponse]]:
+        """
+        Embed the request's user turns and check the semantic cache
+        under key (see SemanticCache.key).
+
+        Returns (vector, cached_response); (None, None) if embedding fails,
+        so the completion just goes to the model.
+        """
+        text = "\n".join(m.content for m in request.messages if m.role == "user")
+        try:
+            response = await self.embed(EmbeddingRequest(texts=[text]))
+        except Exception:
+            return None, None
+        vector = response.embeddings[0]
+        return vector, self.semantic_cache.lookup(key, vector)
+
+    def _health_fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.HEALTH_TTL
+        )
+
+    async def _cached_health(
+        self, probe: Callable[[], Awaitable[ProviderStatus]]
+    ) -> ProviderStatus:
+        """
+        Run probe() at most once per HEALTH_TTL seconds.
+
+        Concurrent callers wait on the single in-flight probe and share
+        its result.
+        """
+        if self._health_fresh():
+            return self._status
+
+        async with self._probe_lock:
+            if self._health_fresh():
+                return self._status
+            self._status = await probe()
+            self._checked_at = time.monotonic()
+
+        return self._status
+
     @abstractmethod
     async def health_check(self) -> ProviderStatus:
         """
@@ -218,23 +547,34 @@ class Provider(ABC):
         model: Optional[str] = None
     ) -> float:
         """Calculate cost for token usage."""
-        input_cost = (input_tokens / 1000) * self.config.cost_per_1k_input
-        output_cost = (output_tokens / 1000) * self.config.cost_per_1k_output
-        return input_cost + output_cost
+        return self._input_rate * input_tokens + self._output_rate * output_tokens
 
     def record_error(self):
         """Record an error for health tracking."""
         self._error_count += 1
-        if self._error_count >= 3:
-            self._status = ProviderStatus.DEGRADED
-        if self._error_count >= 5:
-            self._status = ProviderStatus.UNAVAILABLE
+        status = _ERROR_LADDER[min(self._error_count, len(_ERROR_LADDER) - 1)]
+        if status is not None:
+            self._status = status
 
     def record_success(self):
         """Record a success, reset error count."""
-        self._error_count = max(0, self._error_count - 1)
-        if self._error_count == 0:
+        if self._error_count > 1:
+            self._error_count -= 1
+        else:
+            self._error_count = 0
             self._status = ProviderStatus.HEALTHY
 
+    async def warmup(self):
+        """Open connections ahead of the first request (no-op by default)."""
+
+    async def close(self):
+        """Release network resources held by the provider."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name={self.name}, status={self.status.value})"
@@ -5,10 +5,15 @@ Hailo Provider - On-device AI inference with Hailo-8.
 Runs on lucidia, octavia, and alice.
 """
 
+import asyncio
+import base64
 import os
 import time
-from typing import Optional, AsyncIterator, Dict, Any, List
+from dataclasses import replace
+from functools import lru_cache
+from typing import Optional, AsyncIterator, Dict, Any, List, Tuple, Union, TYPE_CHECKING
 
+from .. import codec
 from .base import (
     Provider,
     ProviderConfig,
@@ -21,6 +26,9 @@ from .base import (
     Message,
 )
 
+if TYPE_CHECKING:
+    from ..caching.semantic import SemanticCache
+
 
 # Hailo-optimized models
 HAILO_MODELS = {
@@ -68,6 +76,35 @@ HAILO_MODELS = {
 }
 
 
+# LLM name -> generation cap, so complete() validates with one lookup
+_HAILO_LLM_MAX_TOKENS = {
+    name: info.get("max_tokens", 2048)
+    for name, info in HAILO_MODELS.items()
+    if info["type"] == "llm"
+}
+
+
+def _b64encode(data: bytes) -> str:
+    """Base64-encode an image/audio payload (run off the event loop)."""
+    return base64.b64encode(data).decode("ascii")
+
+
+_ROLE_PREFIXES = {
+    "system": "System: ",
+    "user": "User: ",
+    "assistant": "Assistant: ",
+}
+
+
+@lru_cache(maxsize=256)
+def _format_turns(turns: Tuple[Tuple[str, str], ...]) -> str:
+    """Render (role, content) turns as a prompt; retries reuse the result."""
+    return "\n\n".join(
+        [_ROLE_PREFIXES[role] + content for role, content in turns if role in _ROLE_PREFIXES]
+        + ["Assistant:"]
+    )
+
+
 def default_config() -> ProviderConfig:
     """Default Hailo configuration."""
     return ProviderConfig(
@@ -115,10 +152,17 @@ class HailoProvider(Provider):
     Note: Requires hailo-platform SDK and a Hailo-8 device.
     """
 
-    def __init__(self, config: Optional[ProviderConfig] = None):
-        super().__init__(config or default_config())
+    HEALTH_TTL = 5.0
+
+    def __init__(
+        self,
+        config: Optional[ProviderConfig] = None,
+        semantic_cache: Optional["SemanticCache"] = None,
+    ):
+        super().__init__(config or default_config(), semantic_cache)
         self._runtime = None
         self._models: Dict[str, Any] = {}
+        self._session = None
 
     @property
     def device(self) -> str:
@@ -130,6 +174,22 @@ class HailoProvider(Provider):
         """Which node this is running on."""
         return self.config.extra.get("node", "unknown")
 
+    @property
+    def session(self):
+        """Lazy-load a keep-alive aiohttp session shared by all calls."""
+        if self._session is None or self._session.closed:
+            import aiohttp
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=16, keepalive_timeout=30)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     def _get_runtime(self):
         """Get or create Hailo runtime."""
         if self._runtime is None:
@@ -146,65 +206,105 @@ class HailoProvider(Provider):
     async def _call_hailo_api(
         self,
         endpoint: str,
-        data: Dict[str, Any]
+        data: Union[Dict[str, Any], bytes]
     ) -> Dict[str, Any]:
-        """Call the local Hailo inference API."""
+        """Call the local Hailo inference API (data may be a pre-encoded body)."""
         import aiohttp
 
         url = f"{self.config.base_url}/{endpoint}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                json=data,
-                timeout=aiohttp.ClientTimeout(total=self.config.timeout)
-            ) as response:
-                if response.status != 200:
-                    raise Exception(f"Hailo API error: {response.status}")
-                return await response.json()
+        async with self.session.post(
+            url,
+            data=data if isinstance(data, bytes) else codec.dumps(data),
+            headers=codec.JSON_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout)
+        ) as response:
+            if response.status != 200:
+                raise Exception(f"Hailo API error: {response.status}")
+            return codec.loads(await response.read())
+
+    def _request_payload(self, request: CompletionRequest) -> Dict[str, Any]:
+        """Build the v1/completions body, checking the model is a Hailo LLM."""
+        model = request.model or self.config.default_model
+
+        max_tokens = _HAILO_LLM_MAX_TOKENS.get(model)
+        if max_tokens is None:
+            if model not in HAILO_MODELS:
+                raise ValueError(f"Model {model} not available on Hailo")
+            raise ValueError(f"Model {model} is not an LLM")
+
+        return {
+            "model": model,
+            "prompt": self._format_prompt(request.messages),
+            "max_tokens": min(request.max_tokens, max_tokens),
+            "temperature": request.temperature,
+            "stop": request.stop,
+        }
+
+    def _completion_response(
+        self, result: Dict[str, Any], model: str, start_time: float
+    ) -> CompletionResponse:
+        """Convert a v1/completions result into a CompletionResponse."""
+        return CompletionResponse(
+            content=result.get("text", ""),
+            model=model,
+            provider=f"{self.name}@{self.node}",
+            input_tokens=result.get("input_tokens", 0),
+            output_tokens=result.get("output_tokens", 0),
+            total_tokens=result.get("total_tokens", 0),
+            cost=0.0,  # Free! On-device inference
+            latency_ms=int((time.time() - start_time) * 1000),
+            finish_reason=result.get("finish_reason", "stop"),
+            raw=result,
+        )
 
     async def complete(self, request: CompletionRequest) -> CompletionResponse:
         """Generate a completion using on-device LLM."""
         model = request.model or self.config.default_model
         start_time = time.time()
 
-        # Check if model is available on Hailo
-        if model not in HAILO_MODELS:
-            raise ValueError(f"Model {model} not available on Hailo")
+        # Raises if the model isn't an LLM available on Hailo
+        payload = self._request_payload(request)
 
-        model_info = HAILO_MODELS[model]
-        if model_info["type"] != "llm":
-            raise ValueError(f"Model {model} is not an LLM")
+        vector = None
+        if self.semantic_cache is not None:
+            cache_key = self.semantic_cache.key(model, request)
+            vector, cached = await self._semantic_lookup(cache_key, request)
+            if cached is not None:
+                return replace(
+                    cached,
+                    provider=f"{self.name}@cache",
+                    latency_ms=int((time.time() - start_time) * 1000),
+                )
 
         try:
-            # Format messages into prompt
-            prompt = self._format_prompt(request.messages)
-
             # Call Hailo inference service
-            result = await self._call_hailo_api("v1/completions", {
-                "model": model,
-                "prompt": prompt,
-                "max_tokens": min(request.max_tokens, model_info.get("max_tokens", 2048)),
-                "temperature": request.temperature,
-                "stop": request.stop,
-            })
-
-            latency_ms = int((time.time() - start_time) * 1000)
+            result = await self._call_hailo_api("v1/completions", payload)
 
             self.record_success()
 
-            return CompletionResponse(
-                content=result.get("text", ""),
-                model=model,
-                provider=f"{self.name}@{self.node}",
-                input_tokens=result.get("input_tokens", 0),
-                output_tokens=result.get("output_tokens", 0),
-                total_tokens=result.get("total_tokens", 0),
-                cost=0.0,  # Free! On-device inference
-                latency_ms=latency_ms,
-                finish_reason=result.get("finish_reason", "stop"),
-                raw_response=result,
-            )
+            response = self._completion_response(result, model, start_time)
+
+            if vector is not None:
+                self.semantic_cache.add(cache_key, vector, response)
+
+            return response
+
+        except Exception as e:
+            self.record_error()
+            raise
+
+    async def complete_template(
+        self, name: str, variables: Dict[str, str]
+    ) -> CompletionResponse:
+        """Complete a compiled template (see Provider.compile_template)."""
+        model, body = self._render_template(name, variables)
+        start_time = time.time()
+
+        try:
+            result = await self._call_hailo_api("v1/completions", body)
+            self.record_success()
+            return self._completion_response(result, model, start_time)
 
         except Exception as e:
             self.record_error()
@@ -220,23 +320,23 @@ class HailoProvider(Provider):
             prompt = self._format_prompt(request.messages)
 
             # Stream from Hailo service
-            import aiohttp
             url = f"{self.config.base_url}/v1/completions/stream"
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "max_tokens": request.max_tokens,
-                        "temperature": request.temperature,
-                    }
-                ) as response:
-                    async for line in response.content:
-                        text = line.decode().strip()
-                        if text:
-                            yield text
+            async with self.session.post(
+                url,
+                data=codec.dumps({
+                    "model": model,
+                    "prompt": prompt,
+                    "max_tokens": request.max_tokens,
+                    "temperature": request.temperature,
+                }),
+                headers=codec.JSON_HEADERS
+            ) as response:
+                # Blank keep-alive lines are dropped before any decode
+                async for line in response.content:
+                    if line.isspace():
+                        continue
+                    yield line.strip().decode()
 
             self.record_success()
 
@@ -250,19 +350,26 @@ class HailoProvider(Provider):
         start_time = time.time()
 
         try:
-            result = await self._call_hailo_api("v1/embeddings", {
-                "model": model,
-                "texts": request.texts,
-            })
+            embeddings, misses = self._cached_embeddings(model, request.texts)
+
+            result: Dict[str, Any] = {}
+            if misses:
+                result = await self._call_hailo_api("v1/embeddings", {
+                    "model": model,
+                    "texts": [request.texts[i] for i in misses],
+                })
+                self._cache_embeddings(
+                    model, request.texts, embeddings, misses,
+                    result.get("embeddings") or [],
+                )
+                self.record_success()
 
             latency_ms = int((time.time() - start_time) * 1000)
 
             model_info = HAILO_MODELS.get(model, {})
 
-            self.record_success()
-
             return EmbeddingResponse(
-                embeddings=result.get("embeddings", []),
+                embeddings=self._embedding_matrix(embeddings),
                 model=model,
                 provider=f"{self.name}@{self.node}",
                 dimensions=model_info.get("dimensions", 384),
@@ -286,11 +393,9 @@ class HailoProvider(Provider):
 
         Returns list of detections with bounding boxes.
         """
-        import base64
-
         result = await self._call_hailo_api("v1/detect", {
             "model": model,
-            "image": base64.b64encode(image).decode(),
+            "image": await asyncio.to_thread(_b64encode, image),
             "confidence_threshold": confidence,
         })
 
@@ -302,43 +407,36 @@ class HailoProvider(Provider):
         model: str = "whisper-tiny"
     ) -> str:
         """Transcribe audio to text."""
-        import base64
-
         result = await self._call_hailo_api("v1/transcribe", {
             "model": model,
-            "audio": base64.b64encode(audio).decode(),
+            "audio": await asyncio.to_thread(_b64encode, audio),
         })
 
         return result.get("text", "")
 
+    async def warmup(self):
+        """Load the runtime and open a pooled connection via a health probe."""
+        self._get_runtime()
+        await self.health_check()
+
     async def health_check(self) -> ProviderStatus:
-        """Check if Hailo device is available."""
+        """Check if Hailo device is available (cached for HEALTH_TTL seconds)."""
+        return await self._cached_health(self._probe_health)
+
+    async def _probe_health(self) -> ProviderStatus:
         try:
-            # Check device exists
-            if os.path.exists(self.device):
-                # Try API ping
-                result = await self._call_hailo_api("health", {})
-                if result.get("status") == "ok":
-                    self._status = ProviderStatus.HEALTHY
-                else:
-                    self._status = ProviderStatus.DEGRADED
-            else:
-                self._status = ProviderStatus.UNAVAILABLE
+            # Check device exists (filesystem call, kept off the event loop)
+            if not await asyncio.to_thread(os.path.exists, self.device):
+                return ProviderStatus.UNAVAILABLE
+
+            # Try API ping
+            result = await self._call_hailo_api("health", {})
+            if result.get("status") == "ok":
+                return ProviderStatus.HEALTHY
+            return ProviderStatus.DEGRADED
         except Exception:
-            self._status = ProviderStatus.UNAVAILABLE
-
-        return self._status
+            return ProviderStatus.UNAVAILABLE
 
     def _format_prompt(self, messages: List[Message]) -> str:
         """Format messages into a single prompt for the LLM."""
-        parts = []
-        for msg in messages:
-            if msg.role == "system":
-                parts.append(f"System: {msg.content}")
-            elif msg.role == "user":
-                parts.append(f"User: {msg.content}")
-            elif msg.role == "assistant":
-                parts.append(f"Assistant: {msg.content}")
-
-        parts.append("Assistant:")
-        return "\n\n".join(parts)
+        return _format_turns(tuple((msg.role, msg.content) for msg in messages))
@@ -5,10 +5,14 @@ Run Llama, Mistral, CodeLlama, and more locally.
 No API costs, full privacy, works offline.
 """
 
+import asyncio
+import base64
 import os
 import time
-from typing import Optional, AsyncIterator, Dict, Any, List
+from dataclasses import replace
+from typing import Optional, AsyncIterator, Dict, Any, List, Tuple, Union, TYPE_CHECKING
 
+from .. import codec
 from .base import (
     Provider,
     ProviderConfig,
@@ -21,6 +25,9 @@ from .base import (
     Message,
 )
 
+if TYPE_CHECKING:
+    from ..caching.semantic import SemanticCache
+
 
 # Common Ollama models
 OLLAMA_MODELS = {
@@ -130,92 +137,237 @@ class OllamaProvider(Provider):
         provider = OllamaProvider()
         response = await provider.complete(request)
 
+    Set extra["transport"] = "httpx" to use httpx instead of aiohttp;
+    with h2 installed and an https base_url, concurrent streams then
+    share one HTTP/2 connection.
+
     Note: Requires Ollama installed and running.
     Install: https://ollama.ai
     """
 
-    def __init__(self, config: Optional[ProviderConfig] = None):
-        super().__init__(config or default_config())
+    HEALTH_TTL = 5.0
+
+    def __init__(
+        self,
+        config: Optional[ProviderConfig] = None,
+        semantic_cache: Optional["SemanticCache"] = None,
+    ):
+        super().__init__(config or default_config(), semantic_cache)
+        self._session = None
+        self._httpx_client = None
+
+    @property
+    def transport(self) -> str:
+        """HTTP client library: "aiohttp" (default) or "httpx"."""
+        return self.config.extra.get("transport", "aiohttp")
+
+    @property
+    def session(self):
+        """Lazy-load a keep-alive aiohttp session shared by all calls."""
+        if self._session is None or self._session.closed:
+            import aiohttp
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=16, keepalive_timeout=30)
+            )
+        return self._session
+
+    @property
+    def httpx_client(self):
+        """Lazy-load a shared httpx client, HTTP/2 when h2 is installed."""
+        if self._httpx_client is None:
+            import httpx
+
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+
+            self._httpx_client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                timeout=httpx.Timeout(self.config.timeout),
+            )
+        return self._httpx_client
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._httpx_client is not None:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
 
     async def _call_api(
         self,
         endpoint: str,
-        data: Dict[str, Any],
+        data: Union[Dict[str, Any], bytes],
         stream: bool = False
     ) -> Any:
-        """Call Ollama API."""
+        """Call Ollama API (data may be a pre-encoded body)."""
+        url = f"{self.config.base_url}/{endpoint}"
+        body = data if isinstance(data, bytes) else codec.dumps(data)
+
+        if self.transport == "httpx":
+            response = await self.httpx_client.post(
+                url, content=body, headers=codec.JSON_HEADERS
+            )
+            if response.status_code != 200:
+                raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+            return codec.loads(response.content)
+
         import aiohttp
 
+        async with self.session.post(
+            url,
+            data=body,
+            headers=codec.JSON_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout)
+        ) as response:
+            if response.status != 200:
+                text = await response.text()
+                raise Exception(f"Ollama API error: {response.status} - {text}")
+
+            if stream:
+                return response
+            return codec.loads(await response.read())
+
+    async def _stream_lines(
+        self, endpoint: str, data: Dict[str, Any]
+    ) -> AsyncIterator[Any]:
+        """POST to a streaming endpoint and yield its body line by line."""
         url = f"{self.config.base_url}/{endpoint}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                json=data,
-                timeout=aiohttp.ClientTimeout(total=self.config.timeout)
+        if self.transport == "httpx":
+            async with self.httpx_client.stream(
+                "POST", url, content=codec.dumps(data), headers=codec.JSON_HEADERS
             ) as response:
-                if response.status != 200:
-                    text = await response.text()
-                    raise Exception(f"Ollama API error: {response.status} - {text}")
+                async for line in response.aiter_lines():
+                    yield line
+            return
 
-                if stream:
-                    return response
-                return await response.json()
+        import aiohttp
+
+        async with self.session.post(
+            url,
+            data=codec.dumps(data),
+            headers=codec.JSON_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout)
+        ) as response:
+            # aiohttp frames the body by newline
+            async for line in response.content:
+                yield line
+
+    async def _get(self, endpoint: str, timeout: Optional[float] = None) -> Tuple[int, bytes]:
+        """GET an endpoint; returns (status, body)."""
+        url = f"{self.config.base_url}/{endpoint}"
+
+        if self.transport == "httpx":
+            response = await self.httpx_client.get(url, timeout=timeout or self.config.timeout)
+            return response.status_code, response.content
+
+        import aiohttp
+
+        async with self.session.get(
+            url, timeout=aiohttp.ClientTimeout(total=timeout or self.config.timeout)
+        ) as response:
+            return response.status, await response.read()
 
     def _format_messages(self, messages: List[Message]) -> List[Dict[str, Any]]:
         """Convert messages to Ollama format."""
-        formatted = []
-        for msg in messages:
-            entry = {
+        return [
+            # Images only for vision models; Ollama takes base64 strings
+            {
                 "role": msg.role,
                 "content": msg.content,
+                "images": [
+                    base64.b64encode(img).decode("ascii") if isinstance(img, bytes) else img
+                    for img in msg.images
+                ],
             }
-
-            # Handle images for vision models
-            if msg.images:
-                entry["images"] = msg.images
-
-            formatted.append(entry)
-
-        return formatted
+            if msg.images
+            else {"role": msg.role, "content": msg.content}
+            for msg in messages
+        ]
+
+    def _request_payload(self, request: CompletionRequest) -> Dict[str, Any]:
+        """Build the api/chat body for a (non-streaming) completion."""
+        return {
+            "model": request.model or self.config.default_model,
+            "messages": self._format_messages(request.messages),
+            "stream": False,
+            "options": {
+                "num_predict": request.max_tokens,
+                "temperature": request.temperature,
+                "stop": request.stop,
+            }
+        }
+
+    def _completion_response(
+        self, result: Dict[str, Any], model: str, start_time: float
+    ) -> CompletionResponse:
+        """Convert an api/chat result into a CompletionResponse."""
+        # Extract tokens from response
+        input_tokens = result.get("prompt_eval_count", 0)
+        output_tokens = result.get("eval_count", 0)
+
+        return CompletionResponse(
+            content=result.get("message", {}).get("content", ""),
+            model=model,
+            provider=self.name,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            cost=0.0,  # Free - local inference
+            latency_ms=int((time.time() - start_time) * 1000),
+            finish_reason=result.get("done_reason", "stop"),
+            raw=result,
+        )
 
     async def complete(self, request: CompletionRequest) -> CompletionResponse:
         """Generate a chat completion."""
         model = request.model or self.config.default_model
         start_time = time.time()
 
+        vector = None
+        if self.semantic_cache is not None:
+            cache_key = self.semantic_cache.key(model, request)
+            vector, cached = await self._semantic_lookup(cache_key, request)
+            if cached is not None:
+                return replace(
+                    cached,
+                    provider=f"{self.name}@cache",
+                    latency_ms=int((time.time() - start_time) * 1000),
+                )
+
         try:
-            result = await self._call_api("api/chat", {
-                "model": model,
-                "messages": self._format_messages(request.messages),
-                "stream": False,
-                "options": {
-                    "num_predict": request.max_tokens,
-                    "temperature": request.temperature,
-                    "stop": request.stop,
-                }
-            })
+            result = await self._call_api("api/chat", self._request_payload(request))
 
-            latency_ms = int((time.time() - start_time) * 1000)
+            self.record_success()
 
-            # Extract tokens from response
-            input_tokens = result.get("prompt_eval_count", 0)
-            output_tokens = result.get("eval_count", 0)
+            response = self._completion_response(result, model, start_time)
 
-            self.record_success()
+            if vector is not None:
+                self.semantic_cache.add(cache_key, vector, response)
 
-            return CompletionResponse(
-                content=result.get("message", {}).get("content", ""),
-                model=model,
-                provider=self.name,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                total_tokens=input_tokens + output_tokens,
-                cost=0.0,  # Free - local inference
-                latency_ms=latency_ms,
-                finish_reason=result.get("done_reason", "stop"),
-                raw_response=result,
-            )
+            return response
+
+        except Exception as e:
+            self.record_error()
+            raise
+
+    async def complete_template(
+        self, name: str, variables: Dict[str, str]
+    ) -> CompletionResponse:
+        """Complete a compiled template (see Provider.compile_template)."""
+        model, body = self._render_template(name, variables)
+        start_time = time.time()
+
+        try:
+            result = await self._call_api("api/chat", body)
+            self.record_success()
+            return self._completion_response(result, model, start_time)
 
         except Exception as e:
             self.record_error()
@@ -225,40 +377,21 @@ class OllamaProvider(Provider):
         self, request: CompletionRequest
     ) -> AsyncIterator[str]:
         """Stream a chat completion."""
-        model = request.model or self.config.default_model
-
-        import aiohttp
-        import json
-
-        url = f"{self.config.base_url}/api/chat"
-
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    json={
-                        "model": model,
-                        "messages": self._format_messages(request.messages),
-                        "stream": True,
-                        "options": {
-                            "num_predict": request.max_tokens,
-                            "temperature": request.temperature,
-                            "stop": request.stop,
-                        }
-                    },
-                    timeout=aiohttp.ClientTimeout(total=self.config.timeout)
-                ) as response:
-                    async for line in response.content:
-                        if line:
-                            try:
-                                data = json.loads(line)
-                                content = data.get("message", {}).get("content", "")
-                                if content:
-                                    yield content
-                                if data.get("done"):
-                                    break
-                            except json.JSONDecodeError:
-                                continue
+            # NDJSON body: each non-blank line is one complete object
+            async for line in self._stream_lines(
+                "api/chat", {**self._request_payload(request), "stream": True}
+            ):
+                if not line or line.isspace():
+                    continue
+                data = codec.loads(line)
+                if "error" in data:
+                    raise Exception(f"Ollama API error: {data['error']}")
+                content = data.get("message", {}).get("content")
+                if content:
+                    yield content
+                if data.get("done"):
+                    break
 
             self.record_success()
 
@@ -272,23 +405,33 @@ class OllamaProvider(Provider):
         start_time = time.time()
 
         try:
-            # Ollama embeds one text at a time
-            embeddings = []
-            for text in request.texts:
-                result = await self._call_api("api/embeddings", {
-                    "model": model,
-                    "prompt": text,
-                })
-                embeddings.append(result.get("embedding", []))
+            # Ollama embeds one text at a time; fan out with bounded concurrency
+            semaphore = asyncio.Semaphore(self.config.extra.get("embed_concurrency", 8))
+
+            async def embed_one(text: str) -> List[float]:
+                async with semaphore:
+                    result = await self._call_api("api/embeddings", {
+                        "model": model,
+                        "prompt": text,
+                    })
+                if "embedding" not in result:
+                    raise ValueError(f"Ollama returned no embedding: {result}")
+                return result["embedding"]
+
+            embeddings, misses = self._cached_embeddings(model, request.texts)
+            if misses:
+                fresh = await asyncio.gather(
+                    *(embed_one(request.texts[i]) for i in misses)
+                )
+                self._cache_embeddings(model, request.texts, embeddings, misses, fresh)
+                self.record_success()
 
             latency_ms = int((time.time() - start_time) * 1000)
 
             model_info = OLLAMA_MODELS.get(model, {})
 
-            self.record_success()
-
             return EmbeddingResponse(
-                embeddings=embeddings,
+                embeddings=self._embedding_matrix(embeddings),
                 model=model,
                 provider=self.name,
                 dimensions=model_info.get("dimensions", len(embeddings[0]) if embeddings else 0),
@@ -301,33 +444,29 @@ class OllamaProvider(Provider):
             self.record_error()
             raise
 
+    async def warmup(self):
+        """Open a pooled connection via a health probe."""
+        await self.health_check()
+
     async def health_check(self) -> ProviderStatus:
-        """Check if Ollama is running."""
-        try:
-            import aiohttp
+        """Check if Ollama is running (cached for HEALTH_TTL seconds)."""
+        return await self._cached_health(self._probe_health)
 
-            url = f"{self.config.base_url}/api/tags"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                    if response.status == 200:
-                        self._status = ProviderStatus.HEALTHY
-                    else:
-                        self._status = ProviderStatus.DEGRADED
+    async def _probe_health(self) -> ProviderStatus:
+        try:
+            status, _ = await self._get("api/tags", timeout=5)
+            if status == 200:
+                return ProviderStatus.HEALTHY
+            return ProviderStatus.DEGRADED
         except Exception:
-            self._status = ProviderStatus.UNAVAILABLE
-
-        return self._status
+            return ProviderStatus.UNAVAILABLE
 
     async def list_models(self) -> List[str]:
         """List available models."""
         try:
-            import aiohttp
-
-            url = f"{self.config.base_url}/api/tags"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    data = await response.json()
-                    return [m["name"] for m in data.get("models", [])]
+            _, body = await self._get("api/tags")
+            data = codec.loads(body)
+            return [m["name"] for m in data.get("models", [])]
         except Exception:
             return []
 
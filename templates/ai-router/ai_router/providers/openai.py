@@ -4,11 +4,14 @@ OpenAI Provider - GPT-4, GPT-3.5, embeddings, and more.
 The heavyweight champion of cloud AI.
 """
 
+import asyncio
+import base64
 import os
 import time
-from typing import Optional, AsyncIterator, Dict, Any, List
+from typing import Optional, AsyncIterator, Dict, Any, List, Set, Tuple
 from dataclasses import dataclass
 
+from .. import codec
 from .base import (
     Provider,
     ProviderConfig,
@@ -19,6 +22,7 @@ from .base import (
     EmbeddingRequest,
     EmbeddingResponse,
     Message,
+    image_media_type,
 )
 
 
@@ -68,6 +72,53 @@ OPENAI_MODELS = {
 }
 
 
+# (input, output) $ per token, flattened once for the completion hot path
+_MODEL_COST_PER_TOKEN = {
+    model: (info["cost_input"] / 1000, info["cost_output"] / 1000)
+    for model, info in OPENAI_MODELS.items()
+}
+
+# text-embedding-3-small rate, for embedding models not listed above
+_DEFAULT_EMBED_COST_PER_TOKEN = 0.00002 / 1000
+
+# Inputs per embeddings call (API limit)
+_MAX_EMBED_BATCH = 2048
+
+# Rate limits and transient server errors are retried with backoff
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _retry_delay(headers, attempt: int) -> float:
+    """Seconds before the next attempt: Retry-After if sent, else backoff."""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form; use the backoff instead
+    return 0.5 * 2 ** attempt
+
+
+def _http_client():
+    """
+    httpx client for the SDK: 256 connections, 64 kept alive.
+
+    Uses HTTP/2 when the optional h2 package is installed.
+    """
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=256, max_keepalive_connections=64),
+    )
+
+
 def default_config() -> ProviderConfig:
     """Default OpenAI configuration."""
     return ProviderConfig(
@@ -99,6 +150,11 @@ class OpenAIProvider(Provider):
     - GPT-3.5-turbo
     - text-embedding-3-small/large
 
+    Completions, streams and embeddings go straight to the REST API over
+    a shared aiohttp session; the SDK client is only loaded on demand.
+    Concurrent single-text embed() calls arriving within
+    extra["coalesce_window_ms"] (default 5, 0 = off) share one request.
+
     Usage:
         provider = OpenAIProvider()
         response = await provider.complete(request)
@@ -107,25 +163,90 @@ class OpenAIProvider(Provider):
     def __init__(self, config: Optional[ProviderConfig] = None):
         super().__init__(config or default_config())
         self._client = None
+        self._session = None
+
+        # model -> texts waiting to be embedded together, and their timers
+        self._embed_pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._embed_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._embed_flushes: Set[asyncio.Task] = set()
+
+    @property
+    def session(self):
+        """Lazy-load a keep-alive aiohttp session shared by all calls."""
+        if self._session is None or self._session.closed:
+            import aiohttp
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=256, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                headers={
+                    "Authorization": f"Bearer {self.config.api_key}",
+                    **codec.JSON_HEADERS,
+                },
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session and the SDK client's pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _call_api(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST to the OpenAI API.
+
+        Rate limits, 5xx responses, connection errors and timeouts are
+        retried, waiting as long as Retry-After asks when it is sent.
+        """
+        import aiohttp
+
+        url = f"{self.config.base_url}/{endpoint}"
+        body = codec.dumps(data)
+
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                async with self.session.post(url, data=body) as response:
+                    if response.status == 200:
+                        return codec.loads(await response.read())
+                    if (
+                        response.status not in _RETRY_STATUSES
+                        or attempt == self.config.max_retries
+                    ):
+                        text = await response.text()
+                        raise Exception(f"OpenAI API error: {response.status} - {text}")
+                    delay = _retry_delay(response.headers, attempt)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.config.max_retries:
+                    raise
+                delay = _retry_delay({}, attempt)
+            await asyncio.sleep(delay)
 
     @property
     def client(self):
-        """Lazy-load the OpenAI client."""
+        """Lazy-load the OpenAI SDK client (for APIs not wrapped here)."""
         if self._client is None:
             try:
                 from openai import AsyncOpenAI
-                self._client = AsyncOpenAI(
-                    api_key=self.config.api_key,
-                    base_url=self.config.base_url,
-                    timeout=self.config.timeout,
-                    max_retries=self.config.max_retries,
-                )
             except ImportError:
                 raise ImportError("openai package required: pip install openai")
+            self._client = AsyncOpenAI(
+                api_key=self.config.api_key,
+                base_url=self.config.base_url,
+                timeout=self.config.timeout,
+                max_retries=self.config.max_retries,
+                http_client=_http_client(),
+            )
         return self._client
 
     def _format_messages(self, messages: List[Message]) -> List[Dict[str, Any]]:
         """Convert our Message format to OpenAI format."""
+        # Common case: plain text turns, no images or names
+        if not any(msg.images or msg.name for msg in messages):
+            return [{"role": msg.role, "content": msg.content} for msg in messages]
+
         formatted = []
         for msg in messages:
             entry: Dict[str, Any] = {
@@ -136,17 +257,15 @@ class OpenAIProvider(Provider):
             if msg.images:
                 content = [{"type": "text", "text": msg.content}]
                 for img in msg.images:
-                    if img.startswith("http"):
-                        content.append({
-                            "type": "image_url",
-                            "image_url": {"url": img}
-                        })
+                    if isinstance(img, bytes):
+                        data = base64.b64encode(img).decode("ascii")
+                        url = f"data:{image_media_type(img)};base64,{data}"
+                    elif img[:4] == "http":
+                        url = img
                     else:
                         # Assume base64
-                        content.append({
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{img}"}
-                        })
+                        url = f"data:{image_media_type(img)};base64,{img}"
+                    content.append({"type": "image_url", "image_url": {"url": url}})
                 entry["content"] = content
             else:
                 entry["content"] = msg.content
@@ -164,32 +283,34 @@ class OpenAIProvider(Provider):
         start_time = time.time()
 
         try:
-            response = await self.client.chat.completions.create(
-                model=model,
-                messages=self._format_messages(request.messages),
-                max_tokens=request.max_tokens,
-                temperature=request.temperature,
-                stop=request.stop,
-                stream=False,
-            )
+            response = await self._call_api("chat/completions", {
+                "model": model,
+                "messages": self._format_messages(request.messages),
+                "max_tokens": request.max_tokens,
+                "temperature": request.temperature,
+                "stop": request.stop,
+                "stream": False,
+            })
 
             latency_ms = int((time.time() - start_time) * 1000)
 
             # Extract usage
-            usage = response.usage
-            input_tokens = usage.prompt_tokens if usage else 0
-            output_tokens = usage.completion_tokens if usage else 0
+            usage = response.get("usage") or {}
+            input_tokens = usage.get("prompt_tokens", 0)
+            output_tokens = usage.get("completion_tokens", 0)
 
             # Calculate cost based on model
-            model_info = OPENAI_MODELS.get(model, {})
-            cost_input = model_info.get("cost_input", self.config.cost_per_1k_input)
-            cost_output = model_info.get("cost_output", self.config.cost_per_1k_output)
-            cost = (input_tokens / 1000 * cost_input) + (output_tokens / 1000 * cost_output)
+            cost_input, cost_output = _MODEL_COST_PER_TOKEN.get(model) or (
+                self._input_rate,
+                self._output_rate,
+            )
+            cost = cost_input * input_tokens + cost_output * output_tokens
 
             self.record_success()
 
+            choice = response["choices"][0]
             return CompletionResponse(
-                content=response.choices[0].message.content or "",
+                content=choice["message"].get("content") or "",
                 model=model,
                 provider=self.name,
                 input_tokens=input_tokens,
@@ -197,8 +318,8 @@ class OpenAIProvider(Provider):
                 total_tokens=input_tokens + output_tokens,
                 cost=cost,
                 latency_ms=latency_ms,
-                finish_reason=response.choices[0].finish_reason,
-                raw_response=response.model_dump(),
+                finish_reason=choice.get("finish_reason"),
+                raw=response,
             )
 
         except Exception as e:
@@ -212,18 +333,34 @@ class OpenAIProvider(Provider):
         model = request.model or self.config.default_model
 
         try:
-            stream = await self.client.chat.completions.create(
-                model=model,
-                messages=self._format_messages(request.messages),
-                max_tokens=request.max_tokens,
-                temperature=request.temperature,
-                stop=request.stop,
-                stream=True,
-            )
-
-            async for chunk in stream:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            async with self.session.post(
+                f"{self.config.base_url}/chat/completions",
+                data=codec.dumps({
+                    "model": model,
+                    "messages": self._format_messages(request.messages),
+                    "max_tokens": request.max_tokens,
+                    "temperature": request.temperature,
+                    "stop": request.stop,
+                    "stream": True,
+                }),
+            ) as response:
+                if response.status != 200:
+                    text = await response.text()
+                    raise Exception(f"OpenAI API error: {response.status} - {text}")
+
+                # Server-sent events: "data: {json}" lines, then "data: [DONE]"
+                async for line in response.content:
+                    if not line.startswith(b"data: "):
+                        continue
+                    data = line[6:].strip()
+                    if data == b"[DONE]":
+                        break
+                    event = codec.loads(data)
+                    if "error" in event:
+                        raise Exception(f"OpenAI API error: {event['error']}")
+                    choices = event.get("choices")
+                    if choices and (content := choices[0]["delta"].get("content")):
+                        yield content
 
             self.record_success()
 
@@ -233,31 +370,90 @@ class OpenAIProvider(Provider):
 
     async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
         """Generate embeddings."""
+        window_ms = self.config.extra.get("coalesce_window_ms", 5)
+        if len(request.texts) != 1 or window_ms <= 0:
+            return await self._embed_now(request)
+
+        model = request.model or "text-embedding-3-small"
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._embed_pending.setdefault(model, [])
+        pending.append((request.texts[0], future))
+
+        if len(pending) >= _MAX_EMBED_BATCH:
+            self._flush_embeds(model)
+        elif len(pending) == 1:
+            self._embed_timers[model] = loop.call_later(
+                window_ms / 1000, self._flush_embeds, model
+            )
+        return await future
+
+    def _flush_embeds(self, model: str):
+        """Send the texts queued for model as one embeddings request."""
+        timer = self._embed_timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._embed_pending.pop(model, None)
+        if batch:
+            task = asyncio.ensure_future(self._embed_coalesced(model, batch))
+            self._embed_flushes.add(task)
+            task.add_done_callback(self._embed_flushes.discard)
+
+    async def _embed_coalesced(
+        self, model: str, batch: List[Tuple[str, asyncio.Future]]
+    ):
+        try:
+            response = await self._embed_now(
+                EmbeddingRequest(texts=[text for text, _ in batch], model=model)
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Usage is only reported per request; split it by text length
+        total_chars = sum(len(text) for text, _ in batch) or 1
+        for (text, future), vector in zip(batch, response.embeddings):
+            if future.done():
+                continue  # caller gave up
+            share = len(text) / total_chars
+            future.set_result(EmbeddingResponse(
+                embeddings=self._embedding_matrix([vector]),
+                model=model,
+                provider=self.name,
+                dimensions=response.dimensions,
+                total_tokens=round(response.total_tokens * share),
+                cost=response.cost * share,
+                latency_ms=response.latency_ms,
+            ))
+
+    async def _embed_now(self, request: EmbeddingRequest) -> EmbeddingResponse:
+        """Embed request.texts in a single API call."""
         model = request.model or "text-embedding-3-small"
         start_time = time.time()
 
         try:
-            response = await self.client.embeddings.create(
-                model=model,
-                input=request.texts,
-            )
+            response = await self._call_api("embeddings", {
+                "model": model,
+                "input": request.texts,
+            })
 
             latency_ms = int((time.time() - start_time) * 1000)
 
             # Extract embeddings
-            embeddings = [item.embedding for item in response.data]
+            embeddings = [item["embedding"] for item in response["data"]]
             dimensions = len(embeddings[0]) if embeddings else 0
-            total_tokens = response.usage.total_tokens if response.usage else 0
+            total_tokens = (response.get("usage") or {}).get("total_tokens", 0)
 
             # Calculate cost
-            model_info = OPENAI_MODELS.get(model, {})
-            cost_input = model_info.get("cost_input", 0.00002)
-            cost = total_tokens / 1000 * cost_input
+            rates = _MODEL_COST_PER_TOKEN.get(model)
+            cost = total_tokens * (rates[0] if rates else _DEFAULT_EMBED_COST_PER_TOKEN)
 
             self.record_success()
 
             return EmbeddingResponse(
-                embeddings=embeddings,
+                embeddings=self._embedding_matrix(embeddings),
                 model=model,
                 provider=self.name,
                 dimensions=dimensions,
@@ -270,11 +466,17 @@ class OpenAIProvider(Provider):
             self.record_error()
             raise
 
+    async def warmup(self):
+        """Open a pooled connection via a health probe."""
+        await self.health_check()
+
     async def health_check(self) -> ProviderStatus:
         """Check if OpenAI is reachable."""
         try:
             # Simple models list call
-            await self.client.models.list()
+            async with self.session.get(f"{self.config.base_url}/models") as response:
+                if response.status != 200:
+                    raise Exception(f"OpenAI API error: {response.status}")
             self._status = ProviderStatus.HEALTHY
         except Exception:
             self._status = ProviderStatus.UNAVAILABLE
@@ -5,9 +5,14 @@ This is the core of BlackRoad's AI routing.
 """
 
 import asyncio
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional, List, Dict, Any, AsyncIterator, Union
+import logging
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field, replace
+from typing import (
+    Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterable,
+    Iterator, Tuple, Union, TYPE_CHECKING,
+)
 
 from ..providers.base import (
     Provider,
@@ -18,13 +23,13 @@ from ..providers.base import (
     EmbeddingRequest,
     EmbeddingResponse,
     Message,
+    utc_now_iso,
 )
-from ..providers.openai import OpenAIProvider
-from ..providers.anthropic import AnthropicProvider
-from ..providers.hailo import HailoProvider
-from ..providers.ollama import OllamaProvider
 from .strategy import RoutingStrategy, CostOptimized, get_strategy
 
+if TYPE_CHECKING:
+    from ..caching.semantic import SemanticCache
+
 
 @dataclass
 class Route:
@@ -35,7 +40,7 @@ class Route:
     latency_ms: int
     cost: float
     error: Optional[str] = None
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = field(default_factory=utc_now_iso)
 
 
 @dataclass
@@ -87,13 +92,30 @@ class Router:
 
         # With strategy
         router = Router(strategy="cost")  # Always pick cheapest
+
+        # Warm connections up front (re-warmed every REWARM_INTERVAL)
+        async with Router() as router:
+            response = await router.complete("Hi")
+
+        # Answer near-duplicate low-temperature prompts from a cache
+        router = Router(semantic_cache=SemanticCache(threshold=0.95))
     """
 
+    # Seconds between re-warms: inside the providers' 30s keep-alive
+    REWARM_INTERVAL = 25.0
+
+    # Recent RouteResults kept for inspection (stats cover all requests)
+    HISTORY_SIZE = 10_000
+
+    # Only fairly deterministic completions are served from the semantic cache
+    SEMANTIC_CACHE_MAX_TEMPERATURE = 0.3
+
     def __init__(
         self,
         providers: Optional[List[Provider]] = None,
         strategy: Union[str, RoutingStrategy] = "cost",
         signal_callback: Optional[callable] = None,
+        semantic_cache: Optional["SemanticCache"] = None,
     ):
         """
         Initialize the router.
@@ -102,17 +124,27 @@ class Router:
             providers: List of providers (auto-configured if None)
             strategy: Routing strategy (name or instance)
             signal_callback: Function to call when signals are emitted
+            semantic_cache: Similarity cache checked before any provider
         """
         self.providers: Dict[str, Provider] = {}
         self._setup_providers(providers)
-
-        if isinstance(strategy, str):
-            self.strategy = get_strategy(strategy)
-        else:
-            self.strategy = strategy
+        self.set_strategy(strategy)
 
         self.signal_callback = signal_callback
-        self._history: List[RouteResult] = []
+        self._logger = logging.getLogger("ai_router")
+        self.semantic_cache = semantic_cache
+        self._history: "deque[RouteResult]" = deque(maxlen=self.HISTORY_SIZE)
+
+        # Running totals behind stats
+        self._total_requests = 0
+        self._successes = 0
+        self._total_cost = 0.0
+        self._total_latency_ms = 0
+        self._by_provider: Counter = Counter()
+        self._rewarm_task: Optional[asyncio.Task] = None
+
+        # (capability, available provider names) -> ranked provider names
+        self._rank_cache: Dict[Tuple[ModelCapability, Tuple[str, ...]], List[str]] = {}
 
     def _setup_providers(self, providers: Optional[List[Provider]]):
         """Set up providers."""
@@ -121,6 +153,11 @@ class Router:
                 self.providers[p.name] = p
         else:
             # Auto-configure default providers
+            from ..providers.openai import OpenAIProvider
+            from ..providers.anthropic import AnthropicProvider
+            from ..providers.hailo import HailoProvider
+            from ..providers.ollama import OllamaProvider
+
             self.providers = {
                 "openai": OpenAIProvider(),
                 "anthropic": AnthropicProvider(),
@@ -128,25 +165,133 @@ class Router:
                 "ollama": OllamaProvider(),
             }
 
+    def set_strategy(self, strategy: Union[str, RoutingStrategy]):
+        """Switch routing strategy, keeping providers and their clients."""
+        if isinstance(strategy, str):
+            self.strategy = get_strategy(strategy)
+        else:
+            self.strategy = strategy
+        self._rank_cache = {}
+
+    async def warmup(self, interval: Optional[float] = None):
+        """
+        Warm every provider's connections at once.
+
+        Args:
+            interval: If set, keep re-warming every interval seconds in
+                the background until close()
+        """
+        await asyncio.gather(
+            *(
+                asyncio.wait_for(provider.warmup(), timeout=5.0)
+                for provider in self.providers.values()
+            ),
+            return_exceptions=True,
+        )
+        if interval and self._rewarm_task is None:
+            self._rewarm_task = asyncio.create_task(self._rewarm(interval))
+
+    async def _rewarm(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.warmup()
+
+    async def close(self):
+        """Close every provider's network resources."""
+        if self._rewarm_task is not None:
+            self._rewarm_task.cancel()
+            self._rewarm_task = None
+        await asyncio.gather(*(p.close() for p in self.providers.values()))
+
+    async def __aenter__(self):
+        await self.warmup(self.REWARM_INTERVAL)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
     def get_provider(self, name: str) -> Optional[Provider]:
         """Get a provider by name."""
         return self.providers.get(name)
 
     async def health_check_all(self) -> Dict[str, ProviderStatus]:
         """Check health of all providers."""
-        results = {}
-        for name, provider in self.providers.items():
-            try:
-                status = await asyncio.wait_for(
-                    provider.health_check(),
-                    timeout=5.0
-                )
-                results[name] = status
-            except asyncio.TimeoutError:
-                results[name] = ProviderStatus.UNAVAILABLE
-            except Exception:
-                results[name] = ProviderStatus.UNAVAILABLE
-        return results
+        # Probe every provider at once so the slowest one bounds the total
+        names = list(self.providers)
+        statuses = await asyncio.gather(
+            *(
+                asyncio.wait_for(provider.health_check(), timeout=5.0)
+                for provider in self.providers.values()
+            ),
+            return_exceptions=True,
+        )
+        return {
+            name: ProviderStatus.UNAVAILABLE if isinstance(status, BaseException) else status
+            for name, status in zip(names, statuses)
+        }
+
+    def _rank(
+        self, request: CompletionRequest, capability: ModelCapability
+    ) -> Iterable[str]:
+        """
+        Provider names in strategy order.
+
+        For cacheable strategies, rankings are reused while the same
+        providers are available, since they only depend on provider
+        config. When the strategy is model-sensitive and a model was
+        given, the order is produced lazily instead: the best provider
+        first, and the full ranking only if the caller moves past it.
+        """
+        if request.model and self.strategy.model_sensitive:
+            return self._rank_lazily(request, capability)
+        if not self.strategy.cacheable:
+            return self.strategy._rank_names(
+                list(self.providers.values()), request, capability
+            )
+
+        key = (
+            capability,
+            tuple(
+                name for name, p in self.providers.items()
+                if p.is_available and p.supports(capability)
+            ),
+        )
+        order = self._rank_cache.get(key)
+        if order is None:
+            order = self._rank_cache[key] = self.strategy._rank_names(
+                list(self.providers.values()), request, capability
+            )
+        return order
+
+    def _rank_lazily(
+        self, request: CompletionRequest, capability: ModelCapability
+    ) -> Iterator[str]:
+        providers = list(self.providers.values())
+        best = self.strategy._best_name(providers, request, capability)
+        if best is None:
+            return
+        yield best
+        for name in self.strategy._rank_names(providers, request, capability):
+            if name != best:
+                yield name
+
+    async def _semantic_lookup(
+        self, key: str, request: CompletionRequest
+    ) -> Tuple[Optional[List[float]], Optional[CompletionResponse]]:
+        """
+        Embed the request's user turns and check the semantic cache
+        under key (see SemanticCache.key).
+
+        Returns (vector, cached_response); (None, None) if no embedding
+        provider works, so the request is routed as usual.
+        """
+        text = "\n".join(m.content for m in request.messages if m.role == "user")
+        try:
+            embedding = await self.embed(text)
+        except Exception:
+            return None, None
+        vector = embedding.embeddings[0]
+        return vector, self.semantic_cache.lookup(key, vector)
 
     async def complete(
         self,
@@ -159,6 +304,7 @@ class Router:
         temperature: float = 0.7,
         stream: bool = False,
         capability: ModelCapability = ModelCapability.CHAT,
+        race: int = 1,
     ) -> RouteResult:
         """
         Complete a prompt using the best available provider.
@@ -172,6 +318,8 @@ class Router:
             temperature: Sampling temperature
             stream: Whether to stream response
             capability: Required capability
+            race: Run this many top providers at once; the first success
+                wins and the rest are cancelled (trades spend for latency)
 
         Returns:
             RouteResult with response and routing info
@@ -190,6 +338,42 @@ class Router:
             stream=stream,
         )
 
+        start_ns = time.monotonic_ns()
+
+        # Serve near-duplicate prompts without calling a model
+        vector = None
+        if (
+            self.semantic_cache is not None
+            and not stream
+            and temperature < self.SEMANTIC_CACHE_MAX_TEMPERATURE
+        ):
+            # Pinned providers/chains get their own partition
+            cache_key = self.semantic_cache.key(
+                request.model or "", request, provider or ",".join(chain or ())
+            )
+            vector, cached = await self._semantic_lookup(cache_key, request)
+            if cached is not None:
+                latency = (time.monotonic_ns() - start_ns) // 1_000_000
+                result = RouteResult(
+                    response=replace(cached, latency_ms=latency, cost=0.0),
+                    routes_tried=[
+                        Route(
+                            provider="cache",
+                            model=cached.model,
+                            success=True,
+                            latency_ms=latency,
+                            cost=0.0,
+                        )
+                    ],
+                    final_provider="cache",
+                    total_latency_ms=latency,
+                    total_cost=0.0,
+                    success=True,
+                )
+                self._emit_signal(result.signal())
+                self._record(result)
+                return result
+
         # Determine provider order
         if provider:
             # Specific provider requested
@@ -199,24 +383,26 @@ class Router:
             provider_order = chain
         else:
             # Use strategy to rank providers
-            ranked = self.strategy.rank_providers(
-                list(self.providers.values()),
-                request,
-                capability,
-            )
-            provider_order = [score.provider.name for score in ranked]
+            provider_order = self._rank(request, capability)
 
-        # Try providers in order
         routes_tried = []
         last_error = None
-        start_time = datetime.now()
+        winner = None  # (provider name, response)
 
-        for provider_name in provider_order:
+        # Race the top providers, then fall back through the rest in order
+        if race > 1:
+            provider_order = list(provider_order)
+            racers = [name for name in provider_order if name in self.providers][:race]
+            winner, last_error = await self._race(racers, request, routes_tried)
+            provider_order = [name for name in provider_order if name not in racers]
+
+        # Try providers in order
+        for provider_name in provider_order if winner is None else ():
             p = self.providers.get(provider_name)
             if not p:
                 continue
 
-            route_start = datetime.now()
+            route_start_ns = time.monotonic_ns()
             try:
                 response = await p.complete(request)
 
@@ -228,30 +414,12 @@ class Router:
                     cost=response.cost,
                 )
                 routes_tried.append(route)
-
-                total_latency = int((datetime.now() - start_time).total_seconds() * 1000)
-                total_cost = sum(r.cost for r in routes_tried)
-
-                result = RouteResult(
-                    response=response,
-                    routes_tried=routes_tried,
-                    final_provider=provider_name,
-                    total_latency_ms=total_latency,
-                    total_cost=total_cost,
-                    success=True,
-                )
-
-                # Emit signal
-                self._emit_signal(result.signal())
-
-                # Track history
-                self._history.append(result)
-
-                return result
+                winner = (provider_name, response)
+                break
 
             except Exception as e:
                 last_error = str(e)
-                latency = int((datetime.now() - route_start).total_seconds() * 1000)
+                latency = (time.monotonic_ns() - route_start_ns) // 1_000_000
                 route = Route(
                     provider=provider_name,
                     model=model or p.config.default_model,
@@ -263,8 +431,34 @@ class Router:
                 routes_tried.append(route)
                 continue
 
+        if winner is not None:
+            provider_name, response = winner
+
+            if vector is not None:
+                self.semantic_cache.add(cache_key, vector, response)
+
+            total_latency = (time.monotonic_ns() - start_ns) // 1_000_000
+            total_cost = sum(r.cost for r in routes_tried)
+
+            result = RouteResult(
+                response=response,
+                routes_tried=routes_tried,
+                final_provider=provider_name,
+                total_latency_ms=total_latency,
+                total_cost=total_cost,
+                success=True,
+            )
+
+            # Emit signal
+            self._emit_signal(result.signal())
+
+            # Track history
+            self._record(result)
+
+            return result
+
         # All providers failed
-        total_latency = int((datetime.now() - start_time).total_seconds() * 1000)
+        total_latency = (time.monotonic_ns() - start_ns) // 1_000_000
         result = RouteResult(
             response=None,
             routes_tried=routes_tried,
@@ -276,10 +470,115 @@ class Router:
         )
 
         self._emit_signal(result.signal())
-        self._history.append(result)
+        self._record(result)
 
         return result
 
+    async def _race(
+        self,
+        names: List[str],
+        request: CompletionRequest,
+        routes_tried: List[Route],
+    ) -> Tuple[Optional[Tuple[str, CompletionResponse]], Optional[str]]:
+        """
+        Run providers concurrently; the first success wins.
+
+        Every racer gets a Route: failures with their error, finished
+        losers with their cost, cancelled losers with cost 0 (whatever
+        they spent before cancellation is not reported).
+
+        Returns ((provider name, response) or None, last error).
+        """
+        start_ns = time.monotonic_ns()
+        tasks = {
+            asyncio.create_task(self.providers[name].complete(request)): name
+            for name in names
+        }
+        pending = set(tasks)
+        winner = None
+        last_error = None
+
+        def failed(name: str, error: str) -> Route:
+            return Route(
+                provider=name,
+                model=request.model or self.providers[name].config.default_model,
+                success=False,
+                latency_ms=(time.monotonic_ns() - start_ns) // 1_000_000,
+                cost=0.0,
+                error=error,
+            )
+
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    name = tasks[task]
+                    if task.exception() is not None:
+                        last_error = str(task.exception())
+                        routes_tried.append(failed(name, last_error))
+                        continue
+                    response = task.result()
+                    routes_tried.append(Route(
+                        provider=name,
+                        model=response.model,
+                        success=winner is None,
+                        latency_ms=response.latency_ms,
+                        cost=response.cost,
+                        error=None if winner is None else "lost race",
+                    ))
+                    if winner is None:
+                        winner = (name, response)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in pending:
+                    routes_tried.append(failed(tasks[task], "cancelled (lost race)"))
+
+        return winner, last_error
+
+    def compile_route(
+        self,
+        provider: str,
+        model: Optional[str] = None,
+        *,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        stop: Optional[List[str]] = None,
+    ) -> Callable[[Union[str, List[Message]]], Awaitable[CompletionResponse]]:
+        """
+        Pin a provider and request settings for a route known up front.
+
+        The returned coroutine function only swaps the messages into a
+        prebuilt request and calls the provider: no ranking, fallback,
+        semantic cache, signals or stats.
+
+        Usage:
+            answer = router.compile_route("openai", "gpt-4o-mini", temperature=0)
+            response = await answer("Summarize: ...")
+        """
+        p = self.providers.get(provider)
+        if p is None:
+            raise ValueError(f"Unknown provider: {provider}")
+
+        template = CompletionRequest(
+            messages=[],
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stop=stop,
+        )
+
+        async def call(prompt: Union[str, List[Message]]) -> CompletionResponse:
+            if isinstance(prompt, str):
+                prompt = [Message(role="user", content=prompt)]
+            return await p.complete(replace(template, messages=prompt))
+
+        return call
+
     async def complete_stream(
         self,
         prompt: Union[str, List[Message]],
@@ -307,12 +606,8 @@ class Router:
         if provider:
             p = self.providers.get(provider)
         else:
-            ranked = self.strategy.rank_providers(
-                list(self.providers.values()),
-                request,
-                ModelCapability.CHAT,
-            )
-            p = ranked[0].provider if ranked else None
+            best = next(iter(self._rank(request, ModelCapability.CHAT)), None)
+            p = self.providers[best] if best else None
 
         if not p:
             raise ValueError("No provider available")
@@ -347,33 +642,35 @@ class Router:
 
         return await p.embed(request)
 
+    def _record(self, result: RouteResult):
+        """Keep a routed result and fold it into the running stats."""
+        self._history.append(result)
+        self._total_requests += 1
+        self._successes += result.success
+        self._total_cost += result.total_cost
+        self._total_latency_ms += result.total_latency_ms
+        self._by_provider[result.final_provider] += 1
+
     def _emit_signal(self, signal: str):
         """Emit a signal."""
         if self.signal_callback:
             self.signal_callback(signal)
-        # Also print for visibility
-        print(f"  {signal}")
+        # Logged rather than printed: no stdout write on the request path
+        self._logger.info(signal)
 
     @property
     def stats(self) -> Dict[str, Any]:
         """Get routing statistics."""
-        if not self._history:
+        total = self._total_requests
+        if not total:
             return {"total": 0, "success_rate": 0, "by_provider": {}, "total_cost": 0}
 
-        successful = [r for r in self._history if r.success]
-        by_provider: Dict[str, int] = {}
-        total_cost = 0.0
-
-        for r in self._history:
-            by_provider[r.final_provider] = by_provider.get(r.final_provider, 0) + 1
-            total_cost += r.total_cost
-
         return {
-            "total": len(self._history),
-            "success_rate": len(successful) / len(self._history),
-            "by_provider": by_provider,
-            "total_cost": total_cost,
-            "avg_latency_ms": sum(r.total_latency_ms for r in self._history) / len(self._history),
+            "total": total,
+            "success_rate": self._successes / total,
+            "by_provider": dict(self._by_provider),
+            "total_cost": self._total_cost,
+            "avg_latency_ms": self._total_latency_ms / total,
         }
 
 
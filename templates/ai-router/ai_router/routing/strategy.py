@@ -9,7 +9,7 @@ Different strategies for different needs:
 - CloudFirst: Always try cloud (for quality)
 """
 
-from abc import ABC, abstractmethod
+from abc import ABC
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 
@@ -34,7 +34,20 @@ class RoutingStrategy(ABC):
 
     name: str = "base"
 
-    @abstractmethod
+    # True if the ranking depends on request.model
+    model_sensitive: bool = False
+
+    # True if the ranking depends only on provider config, so the router
+    # may reuse it for the same set of available providers. Opt-in per
+    # class: subclasses that don't set it themselves are ranked on every
+    # request.
+    cacheable: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "cacheable" not in cls.__dict__:
+            cls.cacheable = False
+
     def rank_providers(
         self,
         providers: List[Provider],
@@ -42,7 +55,7 @@ class RoutingStrategy(ABC):
         capability: ModelCapability = ModelCapability.CHAT,
     ) -> List[ProviderScore]:
         """
-        Rank providers by preference.
+        Rank providers by preference, with scores and reasons.
 
         Args:
             providers: Available providers
@@ -52,7 +65,60 @@ class RoutingStrategy(ABC):
         Returns:
             List of ProviderScore, highest score first
         """
-        pass
+        by_name = {p.name: p for p in providers}
+        scores = []
+        for name in self._rank_names(providers, request, capability):
+            p = by_name[name]
+            score = self._score(p, request)
+            scores.append(
+                ProviderScore(provider=p, score=score, reason=self._reason(p, request, score))
+            )
+        return scores
+
+    def _rank_names(
+        self,
+        providers: List[Provider],
+        request: CompletionRequest,
+        capability: ModelCapability = ModelCapability.CHAT,
+    ) -> List[str]:
+        """Provider names, best first (what the router actually needs)."""
+        if type(self).rank_providers is not RoutingStrategy.rank_providers:
+            # Subclass ranks by overriding rank_providers directly
+            ranked = self.rank_providers(providers, request, capability)
+            return [score.provider.name for score in ranked]
+
+        capable = [p for p in providers if p.is_available and p.supports(capability)]
+        capable.sort(key=lambda p: self._score(p, request), reverse=True)
+        return [p.name for p in capable]
+
+    def _best_name(
+        self,
+        providers: List[Provider],
+        request: CompletionRequest,
+        capability: ModelCapability = ModelCapability.CHAT,
+    ) -> Optional[str]:
+        """Top provider name in one O(n) pass (None if none qualify)."""
+        if type(self).rank_providers is not RoutingStrategy.rank_providers:
+            names = self._rank_names(providers, request, capability)
+            return names[0] if names else None
+
+        capable = [p for p in providers if p.is_available and p.supports(capability)]
+        if not capable:
+            return None
+        # max() keeps the first of equal scores, like the stable sort
+        return max(capable, key=lambda p: self._score(p, request)).name
+
+    def _score(self, provider: Provider, request: CompletionRequest) -> float:
+        """Preference score for one provider (higher is better)."""
+        raise NotImplementedError(
+            f"{type(self).__name__} must implement _score() or rank_providers()"
+        )
+
+    def _reason(
+        self, provider: Provider, request: CompletionRequest, score: float
+    ) -> str:
+        """Human-readable explanation of a score."""
+        return f"Score: {score}"
 
     def filter_available(self, providers: List[Provider]) -> List[Provider]:
         """Filter to only available providers."""
@@ -78,33 +144,22 @@ class CostOptimized(RoutingStrategy):
     """
 
     name = "cost_optimized"
+    cacheable = True
 
-    def rank_providers(
-        self,
-        providers: List[Provider],
-        request: CompletionRequest,
-        capability: ModelCapability = ModelCapability.CHAT,
-    ) -> List[ProviderScore]:
-        available = self.filter_available(providers)
-        capable = self.filter_capable(available, capability)
+    def _score(self, p: Provider, request: CompletionRequest) -> float:
+        # Lower cost = higher score
+        # Free providers get max score
+        if p.config.cost_per_1k_output == 0:
+            return 1000.0
+        # Invert cost: lower cost = higher score
+        avg_cost = (p.config.cost_per_1k_input + p.config.cost_per_1k_output) / 2
+        return 1.0 / (avg_cost + 0.0001)  # Avoid div by zero
 
-        scores = []
-        for p in capable:
-            # Lower cost = higher score
-            # Free providers get max score
-            if p.config.cost_per_1k_output == 0:
-                score = 1000.0
-                reason = "Free (local inference)"
-            else:
-                # Invert cost: lower cost = higher score
-                avg_cost = (p.config.cost_per_1k_input + p.config.cost_per_1k_output) / 2
-                score = 1.0 / (avg_cost + 0.0001)  # Avoid div by zero
-                reason = f"${avg_cost:.4f}/1k tokens"
-
-            scores.append(ProviderScore(provider=p, score=score, reason=reason))
-
-        # Sort by score descending
-        return sorted(scores, key=lambda x: x.score, reverse=True)
+    def _reason(self, p: Provider, request: CompletionRequest, score: float) -> str:
+        if p.config.cost_per_1k_output == 0:
+            return "Free (local inference)"
+        avg_cost = (p.config.cost_per_1k_input + p.config.cost_per_1k_output) / 2
+        return f"${avg_cost:.4f}/1k tokens"
 
 
 class LatencyOptimized(RoutingStrategy):
@@ -118,26 +173,14 @@ class LatencyOptimized(RoutingStrategy):
     """
 
     name = "latency_optimized"
+    cacheable = True
 
-    def rank_providers(
-        self,
-        providers: List[Provider],
-        request: CompletionRequest,
-        capability: ModelCapability = ModelCapability.CHAT,
-    ) -> List[ProviderScore]:
-        available = self.filter_available(providers)
-        capable = self.filter_capable(available, capability)
-
-        scores = []
-        for p in capable:
-            # Lower latency = higher score
-            latency = p.config.avg_latency_ms
-            score = 10000.0 / (latency + 1)  # Invert
-            reason = f"~{latency}ms avg latency"
+    def _score(self, p: Provider, request: CompletionRequest) -> float:
+        # Lower latency = higher score
+        return 10000.0 / (p.config.avg_latency_ms + 1)  # Invert
 
-            scores.append(ProviderScore(provider=p, score=score, reason=reason))
-
-        return sorted(scores, key=lambda x: x.score, reverse=True)
+    def _reason(self, p: Provider, request: CompletionRequest, score: float) -> str:
+        return f"~{p.config.avg_latency_ms}ms avg latency"
 
 
 class QualityOptimized(RoutingStrategy):
@@ -151,6 +194,8 @@ class QualityOptimized(RoutingStrategy):
     """
 
     name = "quality_optimized"
+    cacheable = True
+    model_sensitive = True
 
     # Quality rankings (higher = better)
     QUALITY_RANKS = {
@@ -184,25 +229,19 @@ class QualityOptimized(RoutingStrategy):
         },
     }
 
-    def rank_providers(
-        self,
-        providers: List[Provider],
-        request: CompletionRequest,
-        capability: ModelCapability = ModelCapability.CHAT,
-    ) -> List[ProviderScore]:
-        available = self.filter_available(providers)
-        capable = self.filter_capable(available, capability)
-
-        scores = []
-        for p in capable:
-            model = request.model or p.config.default_model
-            provider_ranks = self.QUALITY_RANKS.get(p.name, {})
-            quality = provider_ranks.get(model, 50)  # Default to 50
-            reason = f"Quality rank: {quality}/100"
+    # (provider, model) -> rank, so scoring is a single lookup
+    _FLAT_RANKS = {
+        (provider, model): rank
+        for provider, models in QUALITY_RANKS.items()
+        for model, rank in models.items()
+    }
 
-            scores.append(ProviderScore(provider=p, score=quality, reason=reason))
+    def _score(self, p: Provider, request: CompletionRequest) -> float:
+        model = request.model or p.config.default_model
+        return self._FLAT_RANKS.get((p.name, model), 50)  # Default to 50
 
-        return sorted(scores, key=lambda x: x.score, reverse=True)
+    def _reason(self, p: Provider, request: CompletionRequest, score: float) -> str:
+        return f"Quality rank: {score}/100"
 
 
 class LocalFirst(RoutingStrategy):
@@ -216,31 +255,21 @@ class LocalFirst(RoutingStrategy):
     """
 
     name = "local_first"
+    cacheable = True
 
-    def rank_providers(
-        self,
-        providers: List[Provider],
-        request: CompletionRequest,
-        capability: ModelCapability = ModelCapability.CHAT,
-    ) -> List[ProviderScore]:
-        available = self.filter_available(providers)
-        capable = self.filter_capable(available, capability)
-
-        scores = []
-        for p in capable:
-            if p.name == "hailo":
-                score = 1000.0
-                reason = "Local: Hailo hardware accelerator"
-            elif p.name == "ollama":
-                score = 900.0
-                reason = "Local: Ollama"
-            else:
-                score = 100.0
-                reason = f"Cloud: {p.name}"
+    def _score(self, p: Provider, request: CompletionRequest) -> float:
+        if p.name == "hailo":
+            return 1000.0
+        if p.name == "ollama":
+            return 900.0
+        return 100.0
 
-            scores.append(ProviderScore(provider=p, score=score, reason=reason))
-
-        return sorted(scores, key=lambda x: x.score, reverse=True)
+    def _reason(self, p: Provider, request: CompletionRequest, score: float) -> str:
+        if p.name == "hailo":
+            return "Local: Hailo hardware accelerator"
+        if p.name == "ollama":
+            return "Local: Ollama"
+        return f"Cloud: {p.name}"
 
 
 class CloudFirst(RoutingStrategy):
@@ -254,31 +283,21 @@ class CloudFirst(RoutingStrategy):
     """
 
     name = "cloud_first"
-
-    def rank_providers(
-        self,
-        providers: List[Provider],
-        request: CompletionRequest,
-        capability: ModelCapability = ModelCapability.CHAT,
-    ) -> List[ProviderScore]:
-        available = self.filter_available(providers)
-        capable = self.filter_capable(available, capability)
-
-        scores = []
-        for p in capable:
-            if p.name == "anthropic":
-                score = 1000.0
-                reason = "Cloud: Anthropic (Claude)"
-            elif p.name == "openai":
-                score = 900.0
-                reason = "Cloud: OpenAI (GPT)"
-            else:
-                score = 100.0
-                reason = f"Local fallback: {p.name}"
-
-            scores.append(ProviderScore(provider=p, score=score, reason=reason))
-
-        return sorted(scores, key=lambda x: x.score, reverse=True)
+    cacheable = True
+
+    def _score(self, p: Provider, request: CompletionRequest) -> float:
+        if p.name == "anthropic":
+            return 1000.0
+        if p.name == "openai":
+            return 900.0
+        return 100.0
+
+    def _reason(self, p: Provider, request: CompletionRequest, score: float) -> str:
+        if p.name == "anthropic":
+            return "Cloud: Anthropic (Claude)"
+        if p.name == "openai":
+            return "Cloud: OpenAI (GPT)"
+        return f"Local fallback: {p.name}"
 
 
 # Strategy registry
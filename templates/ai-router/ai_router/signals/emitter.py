@@ -5,7 +5,11 @@ Signals flow through the BlackRoad mesh:
 AI → OS → wherever they need to go.
 """
 
-from dataclasses import dataclass
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List, Callable, Dict, Any
 from enum import Enum
@@ -24,7 +28,27 @@ class SignalType(Enum):
     LATENCY_ALERT = "latency_alert"
 
 
-@dataclass
+_EMOJI_MAP: Dict[SignalType, str] = {
+    SignalType.INFERENCE_START: "🧠",
+    SignalType.INFERENCE_COMPLETE: "✅",
+    SignalType.INFERENCE_FAILED: "❌",
+    SignalType.FALLBACK_TRIGGERED: "🔄",
+    SignalType.PROVIDER_HEALTHY: "🟢",
+    SignalType.PROVIDER_DEGRADED: "🟡",
+    SignalType.PROVIDER_DOWN: "🔴",
+    SignalType.COST_ALERT: "💰",
+    SignalType.LATENCY_ALERT: "⏱️",
+}
+
+# provider_status() status -> signal type
+_STATUS_TO_SIGNAL: Dict[str, SignalType] = {
+    "healthy": SignalType.PROVIDER_HEALTHY,
+    "degraded": SignalType.PROVIDER_DEGRADED,
+    "down": SignalType.PROVIDER_DOWN,
+}
+
+
+@dataclass(slots=True)
 class Signal:
     """A signal to emit."""
     type: SignalType
@@ -32,31 +56,25 @@ class Signal:
     target: str = "OS"
     data: Optional[Dict[str, Any]] = None
     timestamp: str = None
+    _formatted: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.utcnow().isoformat()
 
     def format(self) -> str:
-        """Format as BlackRoad signal string."""
-        emoji = self._get_emoji()
-        data_str = ", ".join(f"{k}={v}" for k, v in (self.data or {}).items())
-        return f"{emoji} {self.source} → {self.target} : {self.type.value}, {data_str}"
+        """Format as BlackRoad signal string (built once, on first call)."""
+        if self._formatted is None:
+            emoji = self._get_emoji()
+            data_str = ", ".join(f"{k}={v}" for k, v in (self.data or {}).items())
+            self._formatted = (
+                f"{emoji} {self.source} → {self.target} : {self.type.value}, {data_str}"
+            )
+        return self._formatted
 
     def _get_emoji(self) -> str:
         """Get emoji for signal type."""
-        emoji_map = {
-            SignalType.INFERENCE_START: "🧠",
-            SignalType.INFERENCE_COMPLETE: "✅",
-            SignalType.INFERENCE_FAILED: "❌",
-            SignalType.FALLBACK_TRIGGERED: "🔄",
-            SignalType.PROVIDER_HEALTHY: "🟢",
-            SignalType.PROVIDER_DEGRADED: "🟡",
-            SignalType.PROVIDER_DOWN: "🔴",
-            SignalType.COST_ALERT: "💰",
-            SignalType.LATENCY_ALERT: "⏱️",
-        }
-        return emoji_map.get(self.type, "📡")
+        return _EMOJI_MAP.get(self.type, "📡")
 
 
 class SignalEmitter:
@@ -64,7 +82,7 @@ class SignalEmitter:
     Emit signals for AI routing events.
 
     Usage:
-        emitter = SignalEmitter()
+        emitter = SignalEmitter(verbose=True)
 
         # Emit completion signal
         emitter.inference_complete(
@@ -76,30 +94,137 @@ class SignalEmitter:
 
         # Add handler
         emitter.on_signal(lambda s: send_to_webhook(s))
+
+    With async_handlers=True, handlers run on a background thread fed
+    by a bounded queue, so a slow handler cannot stall the caller. When
+    the queue is full a signal is dropped (the oldest queued one, or
+    the new one with drop_policy="drop_newest") and counted in
+    dropped_signals. Handlers registered with inline=True always run
+    in emit().
+
+    Printing (verbose) and the history (record_history) are off by
+    default; with neither, emit() only runs handlers.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        async_handlers: bool = False,
+        queue_size: int = 1024,
+        drop_policy: str = "drop_oldest",
+        history_limit: int = 10_000,
+        record_history: bool = False,
+        verbose: bool = False,
+    ):
+        """
+        Initialize the emitter.
+
+        Args:
+            async_handlers: Run handlers on a background thread
+            queue_size: Signals queued for that thread before dropping
+            drop_policy: "drop_oldest" or "drop_newest" when the queue is full
+            history_limit: Most recent signals kept in history
+            record_history: Keep emitted signals in history
+            verbose: Print each signal as it is emitted
+        """
+        if drop_policy not in ("drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
         self.handlers: List[Callable[[Signal], None]] = []
-        self._history: List[Signal] = []
+        self.inline_handlers: List[Callable[[Signal], None]] = []
+        self._history: "deque[Signal]" = deque(maxlen=history_limit)
+        self.record_history = record_history
+        self.verbose = verbose
+
+        self.async_handlers = async_handlers
+        self.drop_policy = drop_policy
+        self.dropped_signals = 0
+        self._queue: "queue.Queue[Signal]" = queue.Queue(maxsize=queue_size)
+        self._worker: Optional[threading.Thread] = None
 
-    def on_signal(self, handler: Callable[[Signal], None]):
-        """Register a signal handler."""
-        self.handlers.append(handler)
+    def on_signal(self, handler: Callable[[Signal], None], inline: bool = False):
+        """
+        Register a signal handler.
+
+        Args:
+            handler: Called with each Signal
+            inline: Always call from emit(), even with async_handlers
+        """
+        if inline:
+            self.inline_handlers.append(handler)
+        else:
+            self.handlers.append(handler)
 
     def emit(self, signal: Signal):
         """Emit a signal to all handlers."""
-        self._history.append(signal)
+        if self.record_history:
+            self._history.append(signal)
+        if self.verbose:
+            print(f"  {signal.format()}")
 
-        # Print for visibility
-        print(f"  {signal.format()}")
+        self._call_handlers(self.inline_handlers, signal)
+        if not self.async_handlers:
+            self._call_handlers(self.handlers, signal)
+        elif self.handlers:
+            self._enqueue(signal)
 
-        # Call handlers
-        for handler in self.handlers:
+    @staticmethod
+    def _call_handlers(handlers: List[Callable[[Signal], None]], signal: Signal):
+        for handler in handlers:
             try:
                 handler(signal)
             except Exception as e:
                 print(f"  ⚠️ Signal handler error: {e}")
 
+    def _enqueue(self, signal: Signal):
+        """Hand a signal to the background thread, dropping one if full."""
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._drain, name="signal-emitter", daemon=True
+            )
+            self._worker.start()
+
+        while True:
+            try:
+                self._queue.put_nowait(signal)
+                return
+            except queue.Full:
+                self.dropped_signals += 1
+                if self.drop_policy == "drop_newest":
+                    return
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+
+    def _drain(self):
+        """Background thread: run handlers for queued signals."""
+        while True:
+            signal = self._queue.get()
+            try:
+                self._call_handlers(self.handlers, signal)
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued signals to be handled.
+
+        Args:
+            timeout: Seconds to wait at most (None waits indefinitely)
+
+        Returns:
+            True if the queue drained in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
     def inference_start(
         self,
         provider: str,
@@ -169,13 +294,8 @@ class SignalEmitter:
         status: str,  # healthy, degraded, down
     ):
         """Signal provider status change."""
-        type_map = {
-            "healthy": SignalType.PROVIDER_HEALTHY,
-            "degraded": SignalType.PROVIDER_DEGRADED,
-            "down": SignalType.PROVIDER_DOWN,
-        }
         self.emit(Signal(
-            type=type_map.get(status, SignalType.PROVIDER_DEGRADED),
+            type=_STATUS_TO_SIGNAL.get(status, SignalType.PROVIDER_DEGRADED),
             data={"provider": provider, "status": status}
         ))
 
@@ -213,9 +333,9 @@ class SignalEmitter:
 
     @property
     def history(self) -> List[Signal]:
-        """Get signal history."""
-        return self._history.copy()
+        """Get signal history (empty unless record_history is set)."""
+        return list(self._history)
 
     def clear_history(self):
         """Clear signal history."""
-        self._history = []
+        self._history.clear()
@@ -4,14 +4,46 @@ Cost Tracking - Know exactly what you're spending.
 Track every token, every dollar, every provider.
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 import json
+import time
+import weakref
 from pathlib import Path
 
 
-@dataclass
+# Report period -> window length in seconds
+_PERIODS = {
+    "hour": 3600.0,
+    "day": 86400.0,
+    "week": 7 * 86400.0,
+    "month": 30 * 86400.0,
+}
+
+
+# Costs are stored as integer billionths of a dollar, fine enough that
+# per-record rounding stays negligible even for sub-microdollar calls
+NANOS_PER_DOLLAR = 1_000_000_000
+
+
+def _append_lines(path: Path, buf: List[str]):
+    """Append and clear buffered JSON lines."""
+    if not buf:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write("".join(buf))
+    buf.clear()
+
+
+def _epoch(timestamp: str) -> float:
+    """Epoch seconds for a naive UTC ISO timestamp."""
+    return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+
+
+@dataclass(slots=True)
 class UsageRecord:
     """A single usage record."""
     timestamp: str
@@ -20,12 +52,41 @@ class UsageRecord:
     input_tokens: int
     output_tokens: int
     total_tokens: int
-    cost: float
+    cost_nanos: int  # Exact; see cost for dollars
     latency_ms: int
     success: bool
+    timestamp_epoch: float = 0.0  # Same instant as timestamp, for range queries
 
+    def __post_init__(self):
+        # Older storage files only have the ISO string
+        if not self.timestamp_epoch:
+            self.timestamp_epoch = _epoch(self.timestamp)
 
-@dataclass
+    @property
+    def cost(self) -> float:
+        """Cost in dollars."""
+        return self.cost_nanos / NANOS_PER_DOLLAR
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {name: getattr(self, name) for name in _RECORD_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UsageRecord":
+        """Create from a stored dictionary, including older cost formats."""
+        if "cost" in data:
+            data = dict(data)
+            data["cost_nanos"] = round(data.pop("cost") * NANOS_PER_DOLLAR)
+        elif "cost_micros" in data:
+            data = dict(data)
+            data["cost_nanos"] = data.pop("cost_micros") * 1000
+        return cls(**data)
+
+
+_RECORD_FIELDS = tuple(f.name for f in fields(UsageRecord))
+
+
+@dataclass(slots=True, frozen=True)
 class CostReport:
     """Aggregated cost report."""
     period_start: str
@@ -77,6 +138,57 @@ class CostReport:
         return "\n".join(lines)
 
 
+class _Totals:
+    """Running aggregates over a set of usage records."""
+
+    def __init__(self):
+        self.cost_nanos = 0
+        self.tokens = 0
+        self.requests = 0
+        self.successes = 0
+        self.latency_ms = 0
+        self.by_provider: Dict[str, Dict[str, Any]] = {}
+        self.by_model: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, r: UsageRecord):
+        self.cost_nanos += r.cost_nanos
+        self.tokens += r.total_tokens
+        self.requests += 1
+        self.successes += r.success
+        self.latency_ms += r.latency_ms
+
+        for key, groups in ((r.provider, self.by_provider), (r.model, self.by_model)):
+            stats = groups.get(key)
+            if stats is None:
+                stats = groups[key] = {"cost_nanos": 0, "tokens": 0, "requests": 0}
+            stats["cost_nanos"] += r.cost_nanos
+            stats["tokens"] += r.total_tokens
+            stats["requests"] += 1
+
+    def report(self, period_start: str, period_end: str) -> "CostReport":
+        n = self.requests
+        return CostReport(
+            period_start=period_start,
+            period_end=period_end,
+            total_cost=self.cost_nanos / NANOS_PER_DOLLAR,
+            total_tokens=self.tokens,
+            total_requests=n,
+            success_rate=self.successes / n if n else 0,
+            by_provider={k: self._group(v) for k, v in self.by_provider.items()},
+            by_model={k: self._group(v) for k, v in self.by_model.items()},
+            avg_latency_ms=self.latency_ms / n if n else 0,
+        )
+
+    @staticmethod
+    def _group(stats: Dict[str, int]) -> Dict[str, Any]:
+        # A fresh dict in dollars, so later records don't change a report
+        return {
+            "cost": stats["cost_nanos"] / NANOS_PER_DOLLAR,
+            "tokens": stats["tokens"],
+            "requests": stats["requests"],
+        }
+
+
 class CostTracker:
     """
     Track costs across all AI usage.
@@ -85,7 +197,7 @@ class CostTracker:
     - Per-request tracking
     - Aggregated reports
     - Budget alerts
-    - Persistent storage
+    - Persistent storage (JSON lines, appended in batches)
 
     Usage:
         tracker = CostTracker()
@@ -102,18 +214,68 @@ class CostTracker:
             alert()
     """
 
-    def __init__(self, storage_path: Optional[str] = None):
+    # Buffered records are appended once either limit is reached
+    FLUSH_RECORDS = 64
+    FLUSH_INTERVAL_S = 1.0
+
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        cache_ttl_s: float = 5.0,
+    ):
         """
         Initialize the cost tracker.
 
         Args:
             storage_path: Path to persist usage data
+            cache_ttl_s: How long report() may reuse a result (0 disables)
         """
         self.records: List[UsageRecord] = []
         self.storage_path = Path(storage_path) if storage_path else None
+        self.cache_ttl_s = cache_ttl_s
+        # (period, provider) -> (version, expiry, report); _version counts changes
+        self._report_cache: Dict[tuple, tuple] = {}
+        self._version = 0
+        self._reset_totals()
 
-        if self.storage_path and self.storage_path.exists():
-            self._load()
+        # Lines not yet appended to storage_path
+        self._write_buf: List[str] = []
+        self._last_flush = time.monotonic()
+        self._finalizer = None
+
+        if self.storage_path:
+            if self.storage_path.exists():
+                self._load()
+            # Flushes the buffer at exit or when the tracker is collected,
+            # without holding a reference to the tracker itself
+            self._finalizer = weakref.finalize(
+                self, _append_lines, self.storage_path, self._write_buf
+            )
+
+    def __enter__(self) -> "CostTracker":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _reset_totals(self):
+        """Rebuild running aggregates from self.records."""
+        self._version += 1
+        # Records are kept in timestamp order; _timestamps mirrors them
+        # so period reports can bisect to their first record.
+        self.records.sort(key=lambda r: r.timestamp_epoch)
+        self._timestamps: List[float] = [r.timestamp_epoch for r in self.records]
+        self._totals = _Totals()
+        self._provider_totals: Dict[str, _Totals] = {}
+        for r in self.records:
+            self._add_totals(r)
+
+    def _add_totals(self, r: UsageRecord):
+        self._totals.add(r)
+        totals = self._provider_totals.get(r.provider)
+        if totals is None:
+            totals = self._provider_totals[r.provider] = _Totals()
+        totals.add(r)
 
     def record(
         self,
@@ -126,22 +288,32 @@ class CostTracker:
         success: bool = True,
     ):
         """Record a usage event."""
+        now = datetime.now(timezone.utc)
         record = UsageRecord(
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=now.replace(tzinfo=None).isoformat(),
             provider=provider,
             model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
             total_tokens=input_tokens + output_tokens,
-            cost=cost,
+            cost_nanos=round(cost * NANOS_PER_DOLLAR),
             latency_ms=latency_ms,
             success=success,
+            timestamp_epoch=now.timestamp(),
         )
         self.records.append(record)
+        self._version += 1
+        self._timestamps.append(record.timestamp_epoch)
+        self._add_totals(record)
 
         # Persist
         if self.storage_path:
-            self._save()
+            self._write_buf.append(json.dumps(record.to_dict()) + "\n")
+            if (
+                len(self._write_buf) >= self.FLUSH_RECORDS
+                or time.monotonic() - self._last_flush > self.FLUSH_INTERVAL_S
+            ):
+                self.flush()
 
     def record_response(self, response: Any):
         """Record from a CompletionResponse."""
@@ -158,112 +330,100 @@ class CostTracker:
     @property
     def total_cost(self) -> float:
         """Total cost across all records."""
-        return sum(r.cost for r in self.records)
+        return self._totals.cost_nanos / NANOS_PER_DOLLAR
 
     @property
     def total_tokens(self) -> int:
         """Total tokens used."""
-        return sum(r.total_tokens for r in self.records)
+        return self._totals.tokens
 
     def report(
         self,
         period: str = "all",
         provider: Optional[str] = None,
+        use_cache: bool = True,
     ) -> CostReport:
         """
         Generate a cost report.
 
+        A report is reused for up to cache_ttl_s seconds, as long as
+        nothing has been recorded since it was built.
+
         Args:
             period: "hour", "day", "week", "month", "all"
             provider: Filter to specific provider
+            use_cache: Set False to always recompute
 
         Returns:
             CostReport with aggregated data
         """
-        # Filter by time
-        now = datetime.utcnow()
-        if period == "hour":
-            cutoff = now - timedelta(hours=1)
-        elif period == "day":
-            cutoff = now - timedelta(days=1)
-        elif period == "week":
-            cutoff = now - timedelta(weeks=1)
-        elif period == "month":
-            cutoff = now - timedelta(days=30)
-        else:
-            cutoff = datetime.min
-
-        filtered = [
-            r for r in self.records
-            if datetime.fromisoformat(r.timestamp) >= cutoff
-        ]
-
-        # Filter by provider
-        if provider:
-            filtered = [r for r in filtered if r.provider == provider]
-
-        if not filtered:
-            return CostReport(
-                period_start=cutoff.isoformat(),
-                period_end=now.isoformat(),
-                total_cost=0,
-                total_tokens=0,
-                total_requests=0,
-                success_rate=0,
-                by_provider={},
-                by_model={},
-                avg_latency_ms=0,
+        key = (period, provider)
+        if use_cache:
+            cached = self._report_cache.get(key)
+            if cached:
+                version, expiry, report = cached
+                if version == self._version and time.monotonic() < expiry:
+                    return report
+
+        report = self._build_report(period, provider)
+        if self.cache_ttl_s > 0:
+            self._report_cache[key] = (
+                self._version, time.monotonic() + self.cache_ttl_s, report,
             )
-
-        # Aggregate
-        by_provider: Dict[str, Dict[str, Any]] = {}
-        by_model: Dict[str, Dict[str, Any]] = {}
-        total_latency = 0
-        successful = 0
-
-        for r in filtered:
-            # By provider
-            if r.provider not in by_provider:
-                by_provider[r.provider] = {"cost": 0, "tokens": 0, "requests": 0}
-            by_provider[r.provider]["cost"] += r.cost
-            by_provider[r.provider]["tokens"] += r.total_tokens
-            by_provider[r.provider]["requests"] += 1
-
-            # By model
-            if r.model not in by_model:
-                by_model[r.model] = {"cost": 0, "tokens": 0, "requests": 0}
-            by_model[r.model]["cost"] += r.cost
-            by_model[r.model]["tokens"] += r.total_tokens
-            by_model[r.model]["requests"] += 1
-
-            total_latency += r.latency_ms
-            if r.success:
-                successful += 1
-
-        return CostReport(
-            period_start=cutoff.isoformat(),
-            period_end=now.isoformat(),
-            total_cost=sum(r.cost for r in filtered),
-            total_tokens=sum(r.total_tokens for r in filtered),
-            total_requests=len(filtered),
-            success_rate=successful / len(filtered) if filtered else 0,
-            by_provider=by_provider,
-            by_model=by_model,
-            avg_latency_ms=total_latency / len(filtered) if filtered else 0,
-        )
-
-    def _save(self):
-        """Save records to disk."""
+        return report
+
+    def clear_report_cache(self):
+        """Forget cached reports."""
+        self._report_cache.clear()
+
+    def _build_report(self, period: str, provider: Optional[str]) -> CostReport:
+        """Aggregate a report for report()."""
+        now = datetime.now(timezone.utc)
+        period_end = now.replace(tzinfo=None).isoformat()
+        window = _PERIODS.get(period)
+
+        if window is None:
+            # Whole history: served from the running totals
+            period_start = datetime.min.isoformat()
+            if provider:
+                totals = self._provider_totals.get(provider) or _Totals()
+            else:
+                totals = self._totals
+            return totals.report(period_start, period_end)
+
+        cutoff = now - timedelta(seconds=window)
+        period_start = cutoff.replace(tzinfo=None).isoformat()
+
+        # Only the records newer than the cutoff are visited
+        totals = _Totals()
+        start = bisect_left(self._timestamps, cutoff.timestamp())
+        for r in self.records[start:]:
+            if not provider or r.provider == provider:
+                totals.add(r)
+        return totals.report(period_start, period_end)
+
+    def flush(self):
+        """Append buffered records to disk."""
+        self._last_flush = time.monotonic()
+        if self.storage_path:
+            _append_lines(self.storage_path, self._write_buf)
+
+    def close(self):
+        """Flush buffered records and detach the exit-time flush."""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._last_flush = time.monotonic()
+
+    def compact(self):
+        """Rewrite storage from the in-memory records."""
+        self._write_buf.clear()
+        self._last_flush = time.monotonic()
         if not self.storage_path:
             return
 
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self.storage_path, "w") as f:
-            json.dump(
-                [vars(r) for r in self.records],
-                f,
-                indent=2
-            )
+            f.writelines(json.dumps(r.to_dict()) + "\n" for r in self.records)
 
     def _load(self):
         """Load records from disk."""
@@ -271,11 +431,24 @@ class CostTracker:
             return
 
         with open(self.storage_path) as f:
-            data = json.load(f)
-            self.records = [UsageRecord(**r) for r in data]
+            legacy = f.read(1) == "["
+            f.seek(0)
+            if legacy:
+                # Files from before JSON lines hold a single array
+                self.records = [UsageRecord.from_dict(r) for r in json.load(f)]
+            else:
+                self.records = [
+                    UsageRecord.from_dict(json.loads(line)) for line in f if line.strip()
+                ]
+        self._reset_totals()
+
+        if legacy:
+            self.compact()
 
     def clear(self):
         """Clear all records."""
         self.records = []
+        self._write_buf.clear()
+        self._reset_totals()
         if self.storage_path and self.storage_path.exists():
             self.storage_path.unlink()
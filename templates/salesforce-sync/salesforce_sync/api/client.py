@@ -6,20 +6,29 @@ Handles authentication and API calls to Salesforce.
 
 import os
 import json
-from typing import Dict, List, Any, Optional, Type
+import hashlib
+import re
+import threading
+import time
+from types import MappingProxyType
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Type
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # Note: In production, use `simple_salesforce` library
 # pip install simple-salesforce
 
 
-@dataclass
+@dataclass(slots=True)
 class APIUsage:
     """Track API usage."""
     calls_made: int = 0
     daily_limit: int = 15000
     last_reset: Optional[datetime] = None
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
 
     @property
     def calls_remaining(self) -> int:
@@ -30,7 +39,77 @@ class APIUsage:
         return (self.calls_made / self.daily_limit) * 100
 
     def increment(self):
-        self.calls_made += 1
+        with self._lock:
+            self.calls_made += 1
+
+
+# Authenticated Salesforce instances shared across clients:
+# credentials digest -> (expiry, instance)
+_SF_SESSION_CACHE: Dict[str, Tuple[float, Any]] = {}
+# Guards the two dicts; logins hold only their credentials' lock
+_SF_SESSION_LOCK = threading.Lock()
+_SF_LOGIN_LOCKS: Dict[str, threading.Lock] = {}
+SESSION_TTL = 90 * 60  # Salesforce's default session timeout
+
+
+def _session_key(*credentials: Optional[str]) -> str:
+    """Digest of the credentials, so secrets aren't kept as dict keys."""
+    raw = "\0".join(c or "" for c in credentials)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _login_lock(key: str) -> threading.Lock:
+    """Lock serializing logins for one set of credentials."""
+    with _SF_SESSION_LOCK:
+        lock = _SF_LOGIN_LOCKS.get(key)
+        if lock is None:
+            lock = _SF_LOGIN_LOCKS[key] = threading.Lock()
+        return lock
+
+
+# Mock mode data, shared read-only between calls
+_MOCK_CONTACTS = (
+    MappingProxyType({"Id": "003MOCK001", "FirstName": "Jane", "LastName": "Doe", "Email": "jane@example.com"}),
+    MappingProxyType({"Id": "003MOCK002", "FirstName": "John", "LastName": "Smith", "Email": "john@example.com"}),
+)
+_MOCK_LEADS = (
+    MappingProxyType({"Id": "00QMOCK001", "FirstName": "Alice", "LastName": "Wong", "Company": "Acme Corp"}),
+)
+_MOCK_TABLE = {"Contact": _MOCK_CONTACTS, "Lead": _MOCK_LEADS}
+_SOQL_TABLE_RE = re.compile(r"\bFROM\s+(\w+)", re.I)
+
+
+# Subrequests per Composite API call
+COMPOSITE_LIMIT = 25
+
+
+class BulkBatch:
+    """
+    Record operations collected by SalesforceClient.bulk().
+
+    Nothing is sent until the with-block exits; then the operations go
+    out as Composite API requests of up to COMPOSITE_LIMIT each.
+    results holds one entry per operation in order (new ID for creates,
+    True for updates/deletes, None on failure) and errors maps failed
+    operation indexes to Salesforce's error body.
+    """
+
+    def __init__(self):
+        self.operations: List[Tuple[str, str, Optional[str], Optional[Dict[str, Any]]]] = []
+        self.results: List[Any] = []
+        self.errors: Dict[int, Any] = {}
+
+    def create(self, sobject: str, data: Dict[str, Any]):
+        """Queue a create."""
+        self.operations.append(("create", sobject, None, data))
+
+    def update(self, sobject: str, record_id: str, data: Dict[str, Any]):
+        """Queue an update."""
+        self.operations.append(("update", sobject, record_id, data))
+
+    def delete(self, sobject: str, record_id: str):
+        """Queue a delete."""
+        self.operations.append(("delete", sobject, record_id, None))
 
 
 class SalesforceClient:
@@ -57,6 +136,11 @@ class SalesforceClient:
 
         # Delete record
         client.delete("Contact", "003...")
+
+        # Many operations, one API call per 25
+        with client.bulk() as batch:
+            batch.create("Contact", {"LastName": "Doe"})
+            batch.update("Contact", "003...", {"Phone": "555-1234"})
     """
 
     def __init__(
@@ -92,40 +176,81 @@ class SalesforceClient:
 
         # Will be set after connection
         self._sf = None
+        self._session_key: Optional[str] = None
+        self._sobject_cache: Dict[str, Any] = {}  # name -> SFType
+        # Guards _sf/_sobject_cache for calls from worker threads
+        self._lock = threading.RLock()
 
     @property
     def base_url(self) -> str:
         """Get API base URL."""
         return f"{self.instance_url}/services/data/v{self.api_version}"
 
-    def connect(self) -> bool:
+    def connect(self, force: bool = False) -> bool:
         """
         Connect to Salesforce.
 
-        Returns True if connection successful.
+        Returns True if connection successful. Sessions are shared by
+        clients with the same credentials for SESSION_TTL seconds, so
+        repeat connects don't log in again. force=True drops the shared
+        session and logs in again with username/password, for when
+        Salesforce has expired it early (an expired access token can't
+        be renewed without them).
         """
         try:
             # Try to import simple_salesforce
             from simple_salesforce import Salesforce
 
+            if force and self._username and self._password:
+                self.access_token = None
             if self.access_token and self.instance_url:
-                # Use existing token
-                self._sf = Salesforce(
-                    instance_url=self.instance_url,
-                    session_id=self.access_token
-                )
+                password_auth = False
+                key = _session_key("token", self.instance_url, self.access_token)
             elif self._username and self._password:
-                # Username/password auth
-                self._sf = Salesforce(
-                    username=self._username,
-                    password=self._password,
-                    security_token=self._security_token or ""
+                password_auth = True
+                key = _session_key(
+                    "password", self._username, self._password, self._security_token
                 )
-                self.instance_url = self._sf.sf_instance
-                self.access_token = self._sf.session_id
             else:
                 raise ValueError("No valid credentials provided")
 
+            with _login_lock(key):
+                with _SF_SESSION_LOCK:
+                    if force:
+                        # Drop the expired session, unless another client
+                        # has already replaced it with a fresh one
+                        for stale_key in {self._session_key, key}:
+                            entry = _SF_SESSION_CACHE.get(stale_key)
+                            if entry and entry[1] is self._sf:
+                                del _SF_SESSION_CACHE[stale_key]
+                    cached = _SF_SESSION_CACHE.get(key)
+                if cached and time.monotonic() < cached[0]:
+                    sf = cached[1]
+                else:
+                    if password_auth:
+                        # Username/password auth
+                        sf = Salesforce(
+                            username=self._username,
+                            password=self._password,
+                            security_token=self._security_token or ""
+                        )
+                    else:
+                        # Use existing token
+                        sf = Salesforce(
+                            instance_url=self.instance_url,
+                            session_id=self.access_token
+                        )
+                    with _SF_SESSION_LOCK:
+                        _SF_SESSION_CACHE[key] = (time.monotonic() + SESSION_TTL, sf)
+            with self._lock:
+                self._sf = sf
+                self._sobject_cache = {}
+                self._session_key = key
+
+            if password_auth:
+                self.instance_url = self._sf.sf_instance
+                self.access_token = self._sf.session_id
+
             return True
 
         except ImportError:
@@ -141,6 +266,35 @@ class SalesforceClient:
         print("Running in mock mode - no actual SF connection")
         return True
 
+    def _reauth_on_expiry(self, call):
+        """
+        Run call(), logging in again and retrying once if Salesforce
+        reports the session expired (HTTP 401). Token-only clients have
+        no way to log in again, so the error is raised as is. When several
+        threads hit the expiry at once, only the first logs in again.
+        """
+        sf = self._sf
+        try:
+            return call()
+        except Exception as e:
+            if getattr(e, "status", None) != 401:
+                raise
+            if not (self._username and self._password):
+                raise
+            with self._lock:
+                # Another thread may already have replaced the session
+                if self._sf is sf and not self.connect(force=True):
+                    raise
+        return call()
+
+    def _obj(self, sobject: str) -> Any:
+        """SFType for an object, built once per connection."""
+        with self._lock:
+            obj = self._sobject_cache.get(sobject)
+            if obj is None:
+                obj = self._sobject_cache[sobject] = getattr(self._sf, sobject)
+            return obj
+
     def query(self, soql: str) -> List[Dict[str, Any]]:
         """
         Execute SOQL query.
@@ -154,7 +308,7 @@ class SalesforceClient:
         self.usage.increment()
 
         if self._sf:
-            result = self._sf.query(soql)
+            result = self._reauth_on_expiry(lambda: self._sf.query(soql))
             return result.get("records", [])
         else:
             # Mock response
@@ -167,7 +321,7 @@ class SalesforceClient:
         self.usage.increment()
 
         if self._sf:
-            result = self._sf.query_all(soql)
+            result = self._reauth_on_expiry(lambda: self._sf.query_all(soql))
             return result.get("records", [])
         else:
             return self._mock_query(soql)
@@ -186,8 +340,7 @@ class SalesforceClient:
         self.usage.increment()
 
         if self._sf:
-            obj = getattr(self._sf, sobject)
-            return obj.get(record_id)
+            return self._reauth_on_expiry(lambda: self._obj(sobject).get(record_id))
         else:
             return self._mock_get(sobject, record_id)
 
@@ -205,8 +358,7 @@ class SalesforceClient:
         self.usage.increment()
 
         if self._sf:
-            obj = getattr(self._sf, sobject)
-            result = obj.create(data)
+            result = self._reauth_on_expiry(lambda: self._obj(sobject).create(data))
             return result["id"]
         else:
             return self._mock_create(sobject, data)
@@ -226,8 +378,7 @@ class SalesforceClient:
         self.usage.increment()
 
         if self._sf:
-            obj = getattr(self._sf, sobject)
-            obj.update(record_id, data)
+            self._reauth_on_expiry(lambda: self._obj(sobject).update(record_id, data))
             return True
         else:
             return self._mock_update(sobject, record_id, data)
@@ -246,8 +397,7 @@ class SalesforceClient:
         self.usage.increment()
 
         if self._sf:
-            obj = getattr(self._sf, sobject)
-            obj.delete(record_id)
+            self._reauth_on_expiry(lambda: self._obj(sobject).delete(record_id))
             return True
         else:
             return self._mock_delete(sobject, record_id)
@@ -257,25 +407,73 @@ class SalesforceClient:
         self.usage.increment()
 
         if self._sf:
-            obj = getattr(self._sf, sobject)
-            return obj.describe()
+            return self._reauth_on_expiry(lambda: self._obj(sobject).describe())
         else:
             return {"name": sobject, "fields": []}
 
+    @contextmanager
+    def bulk(self) -> Iterator[BulkBatch]:
+        """
+        Collect create/update/delete calls and send them together.
+
+        Operations are submitted when the block exits without an
+        exception. Each Composite request counts as one API call.
+        """
+        batch = BulkBatch()
+        yield batch
+        self._submit_bulk(batch)
+
+    def _submit_bulk(self, batch: BulkBatch):
+        """Send a batch's operations as Composite API requests."""
+        ops = batch.operations
+        for start in range(0, len(ops), COMPOSITE_LIMIT):
+            chunk = ops[start:start + COMPOSITE_LIMIT]
+            self.usage.increment()
+
+            if not self._sf:
+                for op, sobject, record_id, data in chunk:
+                    if op == "create":
+                        batch.results.append(self._mock_create(sobject, data))
+                    elif op == "update":
+                        batch.results.append(self._mock_update(sobject, record_id, data))
+                    else:
+                        batch.results.append(self._mock_delete(sobject, record_id))
+                continue
+
+            requests = []
+            for i, (op, sobject, record_id, data) in enumerate(chunk, start):
+                url = f"/services/data/v{self.api_version}/sobjects/{sobject}"
+                request = {"referenceId": f"op{i}"}
+                if op == "create":
+                    request.update(method="POST", url=url, body=data)
+                elif op == "update":
+                    request.update(method="PATCH", url=f"{url}/{record_id}", body=data)
+                else:
+                    request.update(method="DELETE", url=f"{url}/{record_id}")
+                requests.append(request)
+
+            response = self._reauth_on_expiry(lambda: self._sf.restful(
+                "composite",
+                method="POST",
+                json={"allOrNone": False, "compositeRequest": requests},
+            ))
+            for i, (sub, (op, *_)) in enumerate(
+                zip(response["compositeResponse"], chunk), start
+            ):
+                if sub["httpStatusCode"] >= 400:
+                    batch.results.append(None)
+                    batch.errors[i] = sub["body"]
+                else:
+                    batch.results.append(sub["body"]["id"] if op == "create" else True)
+
     # Mock methods for development without SF connection
 
     def _mock_query(self, soql: str) -> List[Dict]:
-        """Return mock data for queries."""
-        if "Contact" in soql:
-            return [
-                {"Id": "003MOCK001", "FirstName": "Jane", "LastName": "Doe", "Email": "jane@example.com"},
-                {"Id": "003MOCK002", "FirstName": "John", "LastName": "Smith", "Email": "john@example.com"},
-            ]
-        if "Lead" in soql:
-            return [
-                {"Id": "00QMOCK001", "FirstName": "Alice", "LastName": "Wong", "Company": "Acme Corp"},
-            ]
-        return []
+        """Return mock data for queries (fresh dicts, like a real query)."""
+        match = _SOQL_TABLE_RE.search(soql)
+        if not match:
+            return []
+        return [dict(r) for r in _MOCK_TABLE.get(match.group(1).capitalize(), ())]
 
     def _mock_get(self, sobject: str, record_id: str) -> Dict:
         return {"Id": record_id, "Name": f"Mock {sobject}"}
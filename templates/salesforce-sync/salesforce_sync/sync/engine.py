@@ -6,6 +6,7 @@ The heart of the salesforce-sync system.
 
 import sqlite3
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Type, Optional, Any
 from datetime import datetime
 from pathlib import Path
@@ -159,6 +160,10 @@ class ObjectSync:
         Returns:
             Number of records synced
         """
+        return self._save_results(self._query_sf(since))
+
+    def _query_sf(self, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Fetch records for sync_from_sf (network only, no DB access)."""
         # Build query
         fields = list(self.model.SF_FIELDS.values())
         soql = f"SELECT {', '.join(fields)} FROM {self.model.SF_OBJECT}"
@@ -169,9 +174,10 @@ class ObjectSync:
         soql += " ORDER BY LastModifiedDate DESC LIMIT 2000"
 
         # Query Salesforce
-        results = self.client.query_all(soql)
+        return self.client.query_all(soql)
 
-        # Save locally
+    def _save_results(self, results: List[Dict[str, Any]]) -> int:
+        """Save fetched records locally; returns the count."""
         count = 0
         for sf_data in results:
             record = self.model.from_sf_dict(sf_data)
@@ -310,15 +316,28 @@ class SFSync:
         """
         Sync all object types.
 
-        Returns dict of object -> count synced.
+        Returns dict of object -> count synced. The four Salesforce
+        queries run in parallel.
         """
         since = since or self._last_sync
-        results = {}
-
-        results["contacts"] = self.contacts.sync_from_sf(since)
-        results["leads"] = self.leads.sync_from_sf(since)
-        results["accounts"] = self.accounts.sync_from_sf(since)
-        results["opportunities"] = self.opportunities.sync_from_sf(since)
+        syncs = {
+            "contacts": self.contacts,
+            "leads": self.leads,
+            "accounts": self.accounts,
+            "opportunities": self.opportunities,
+        }
+        results = dict.fromkeys(syncs, 0)  # Keeps the usual key order
+
+        # Queries run concurrently; the SQLite connection belongs to this
+        # thread, so results are saved here as each query finishes.
+        with ThreadPoolExecutor(max_workers=len(syncs)) as pool:
+            futures = {
+                pool.submit(object_sync._query_sf, since): name
+                for name, object_sync in syncs.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                results[name] = syncs[name]._save_results(future.result())
 
         self._last_sync = datetime.utcnow()
 